@@ -0,0 +1,30 @@
+"""Add row version
+
+Revision ID: 2a9e4f7c1b85
+Revises: 8f3c1d0b6a27
+Create Date: 2026-10-18 13:05:44.918230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a9e4f7c1b85'
+down_revision = '8f3c1d0b6a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name in ('charityproject', 'donation'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column(
+                'version', sa.Integer(), server_default='1', nullable=False
+            ))
+
+
+def downgrade():
+    for table_name in ('donation', 'charityproject'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('version')
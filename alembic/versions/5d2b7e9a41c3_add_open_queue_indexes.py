@@ -0,0 +1,46 @@
+"""Add open queue indexes
+
+Revision ID: 5d2b7e9a41c3
+Revises: c1a13f0a406e
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2b7e9a41c3'
+down_revision = 'c1a13f0a406e'
+branch_labels = None
+depends_on = None
+
+OPEN_QUEUE_COLUMNS = [
+    'fully_invested', 'create_date', 'id', 'full_amount', 'invested_amount'
+]
+
+
+def upgrade():
+    for table_name in ('charityproject', 'donation'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.create_index(
+                f'ix_{table_name}_open_queue',
+                OPEN_QUEUE_COLUMNS,
+                unique=False,
+                sqlite_where=sa.text('fully_invested IS 0'),
+                postgresql_where=sa.text('fully_invested IS false'),
+            )
+    with op.batch_alter_table('donation', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_donation_user_id_create_date',
+            ['user_id', 'create_date', 'id'],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('donation', schema=None) as batch_op:
+        batch_op.drop_index('ix_donation_user_id_create_date')
+    for table_name in ('donation', 'charityproject'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table_name}_open_queue')
@@ -0,0 +1,31 @@
+"""Add create date indexes
+
+Revision ID: 6c4e0b9d2f13
+Revises: 2a9e4f7c1b85
+Create Date: 2026-10-18 14:21:09.375142
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6c4e0b9d2f13'
+down_revision = '2a9e4f7c1b85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name in ('charityproject', 'donation'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.create_index(
+                f'ix_{table_name}_create_date_id',
+                ['create_date', 'id'],
+                unique=False,
+            )
+
+
+def downgrade():
+    for table_name in ('donation', 'charityproject'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table_name}_create_date_id')
@@ -0,0 +1,85 @@
+"""Add normalized project name
+
+Revision ID: d2e6f8a4b719
+Revises: b7d4a1e3c958
+Create Date: 2026-10-18 18:52:13.087341
+
+"""
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e6f8a4b719'
+down_revision = 'b7d4a1e3c958'
+branch_labels = None
+depends_on = None
+
+
+def normalize_project_name(name):
+    return ' '.join(name.casefold().split())
+
+
+def check_name_collisions(rows):
+    """
+    Проверка, что нормализованные имена проектов уникальны. Иначе
+    уникальный индекс не создать: миграция останавливается до изменения
+    схемы и перечисляет id проектов, имена которых нужно развести.
+    """
+    ids_by_name = defaultdict(list)
+    for project_id, name in rows:
+        ids_by_name[normalize_project_name(name)].append(project_id)
+    collisions = {
+        name: ids for name, ids in ids_by_name.items() if len(ids) > 1
+    }
+    if collisions:
+        raise RuntimeError(
+            'Имена проектов совпадают без учёта регистра и пробелов, '
+            'переименуйте проекты и повторите миграцию: ' + '; '.join(
+                f'{name!r}: id {", ".join(map(str, sorted(ids)))}'
+                for name, ids in sorted(collisions.items())
+            )
+        )
+
+
+def upgrade():
+    connection = op.get_bind()
+    projects = sa.table(
+        'charityproject',
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('normalized_name', sa.String),
+    )
+    rows = connection.execute(
+        sa.select(projects.c.id, projects.c.name)
+    ).all()
+    check_name_collisions(rows)
+    with op.batch_alter_table('charityproject', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('normalized_name', sa.String(length=100), nullable=True)
+        )
+    for project_id, name in rows:
+        connection.execute(
+            projects.update().where(projects.c.id == project_id).values(
+                normalized_name=normalize_project_name(name)
+            )
+        )
+    with op.batch_alter_table('charityproject', schema=None) as batch_op:
+        batch_op.alter_column(
+            'normalized_name',
+            existing_type=sa.String(length=100),
+            nullable=False,
+        )
+        batch_op.create_index(
+            'ix_charityproject_normalized_name',
+            ['normalized_name'],
+            unique=True,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('charityproject', schema=None) as batch_op:
+        batch_op.drop_index('ix_charityproject_normalized_name')
+        batch_op.drop_column('normalized_name')
@@ -0,0 +1,42 @@
+"""Add investment page indexes
+
+Revision ID: e4b9c2d7a816
+Revises: d2e6f8a4b719
+Create Date: 2026-10-18 21:07:44.516392
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9c2d7a816'
+down_revision = 'd2e6f8a4b719'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'project_id': 'donation_id',
+    'donation_id': 'project_id',
+}
+
+
+def upgrade():
+    with op.batch_alter_table('investment', schema=None) as batch_op:
+        for column, old_column in INDEXES.items():
+            batch_op.drop_index(f'ix_investment_{column}_{old_column}')
+            batch_op.create_index(
+                f'ix_investment_{column}_create_date',
+                [column, 'create_date', 'id'],
+                unique=False,
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('investment', schema=None) as batch_op:
+        for column, old_column in INDEXES.items():
+            batch_op.drop_index(f'ix_investment_{column}_create_date')
+            batch_op.create_index(
+                f'ix_investment_{column}_{old_column}',
+                [column, old_column],
+                unique=False,
+            )
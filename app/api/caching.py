@@ -0,0 +1,63 @@
+from http import HTTPStatus
+from typing import Dict, NamedTuple
+
+from fastapi import Request, Response
+
+from app.core import settings
+
+WEAK_ETAG_PREFIX = 'W/'
+
+
+class CachedResponse(NamedTuple):
+    """Готовый ответ со списком, сохранённый в кеше процесса."""
+    etag: str
+    body: bytes
+    headers: Dict[str, str]
+
+
+def make_etag(version: int, variant: str = 'json') -> str:
+    """Слабый ETag представления списка для версии данных."""
+    return f'{WEAK_ETAG_PREFIX}"{version}-{variant}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Проверка заголовка If-None-Match со слабым сравнением:
+    префикс W/ у сравниваемых тегов не учитывается.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    tags = {
+        tag.strip().removeprefix(WEAK_ETAG_PREFIX)
+        for tag in if_none_match.split(',')
+    }
+    return '*' in tags or etag.removeprefix(WEAK_ETAG_PREFIX) in tags
+
+
+def get_cache_headers(etag: str) -> Dict[str, str]:
+    """Заголовки кеширования списка для клиентов и обратного прокси."""
+    return {
+        'ETag': etag,
+        'Cache-Control': settings.project_list_cache_control,
+        'Vary': 'Accept',
+    }
+
+
+def not_modified(etag: str) -> Response:
+    """Ответ 304 без тела для неизменившегося списка."""
+    return Response(
+        status_code=HTTPStatus.NOT_MODIFIED,
+        headers=get_cache_headers(etag),
+    )
+
+
+def replay_cached(request: Request, cached: CachedResponse) -> Response:
+    """Ответ из кеша процесса с той же проверкой If-None-Match."""
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag)
+    return Response(
+        content=cached.body,
+        media_type='application/json',
+        headers=cached.headers,
+    )
@@ -1,25 +1,46 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
+from app.api.caching import (
+    CachedResponse, etag_matches, get_cache_headers, make_etag,
+    not_modified, replay_cached
+)
+from app.api.pagination import PageParams, paginate
+from app.api.serialization import get_schema_columns, rows_response
+from app.api.streaming import accepts_ndjson, ndjson_response
 from app.api.validators import (
-    check_charity_project_name_duplicate,
+    check_charity_project_can_be_updated,
+    check_charity_project_name_unique,
     check_charity_project_exist,
     check_project_invest_amount_is_empty,
     check_project_is_close,
-    check_full_amount_no_less_than_invested_amount,
 )
-from app.core import get_async_session, current_superuser
-from app.crud import charity_project_crud, donation_crud
-from app.services import investing_process
+from app.core import (
+    current_superuser, get_async_session, get_read_session, settings
+)
+from app.crud import (
+    charity_project_crud, data_version_crud, fundraising_summary_crud,
+    investment_crud
+)
+from app.models import CharityProject, Investment
+from app.services import (
+    allocation_worker, create_and_invest, project_cache,
+    update_charity_project, write_retry
+)
 from app.schemas import (
-    CharityProjectCreate, CharityProjectDB, CharityProjectUpdate
+    CharityProjectCreate, CharityProjectDB, CharityProjectUpdate,
+    FundraisingSummaryDB, InvestmentDB
 )
 
 
 router = APIRouter()
 
+PROJECT_COLUMNS = get_schema_columns(CharityProject, CharityProjectDB)
+INVESTMENT_COLUMNS = get_schema_columns(Investment, InvestmentDB)
+
 
 @router.post(
     '/',
@@ -34,24 +55,22 @@ async def create_new_charity_project(
     """
     Только для суперюзеров.
     Создаёт благотворительный проект.
+    Повтор названия определяется уникальным индексом при вставке,
+    без отдельного запроса.
     """
-    await check_charity_project_name_duplicate(
-        charity_project_name=charity_project.name,
-        session=session
-    )
-    new_charity_project = await charity_project_crud.create(
-        obj_in=charity_project,
-        session=session,
-        commit=False
-    )
-    session.add_all(
-        investing_process(
-            target=new_charity_project,
-            sources=await donation_crud.get_not_fully_invested(session),
+    with check_charity_project_name_unique():
+        if allocation_worker.is_running:
+            return await allocation_worker.submit(
+                crud=charity_project_crud,
+                obj_in=charity_project,
+                schema=CharityProjectDB,
+            )
+        [new_charity_project] = await create_and_invest(
+            crud=charity_project_crud,
+            objs_in=[charity_project],
+            schema=CharityProjectDB,
+            session=session,
         )
-    )
-    await session.commit()
-    await session.refresh(new_charity_project)
     return new_charity_project
 
 
@@ -61,13 +80,72 @@ async def create_new_charity_project(
     response_model=List[CharityProjectDB]
 )
 async def get_all_charity_projects(
-        session: AsyncSession = Depends(get_async_session),
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(),
+        session: AsyncSession = Depends(get_read_session),
 ):
-    """Возвращает список всех проектов."""
-    all_charity_projects = await charity_project_crud.get_multi(
-        session=session
+    """
+    Возвращает список всех проектов в порядке создания.
+    С параметром limit — постранично, курсор следующей страницы
+    передаётся в заголовке X-Next-Cursor.
+    С заголовком Accept: application/x-ndjson проекты отдаются
+    построчно по мере чтения из БД.
+    Выбираются только столбцы схемы ответа, и строки кодируются
+    без повторной валидации.
+    Ответ помечается слабым ETag по версии данных: при совпадении
+    If-None-Match список не читается и возвращается 304.
+    Готовые JSON-ответы хранятся в кеше процесса до изменения проектов.
+    """
+    ndjson = accepts_ndjson(request)
+    cache_key = (page.limit, page.after)
+    if not ndjson:
+        cached = project_cache.get_list(cache_key)
+        if cached is not None:
+            return replay_cached(request, cached)
+    generation = project_cache.generation
+    etag = make_etag(
+        await data_version_crud.get_version(session),
+        'ndjson' if ndjson else 'json',
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(get_cache_headers(etag))
+    if ndjson:
+        return ndjson_response(charity_project_crud.stream_page(
+            session=session,
+            yield_per=settings.export_yield_per,
+            limit=page.limit,
+            after=page.after,
+            columns=PROJECT_COLUMNS,
+        ), headers=response.headers)
+    charity_projects = await charity_project_crud.get_page(
+        session=session,
+        limit=page.limit,
+        after=page.after,
+        columns=PROJECT_COLUMNS,
+    )
+    charity_projects = paginate(response, charity_projects, page)
+    list_response = rows_response(charity_projects, headers=response.headers)
+    project_cache.put_list(
+        cache_key,
+        CachedResponse(etag, list_response.body, dict(response.headers)),
+        generation,
     )
-    return all_charity_projects
+    return list_response
+
+
+@router.get('/stats', response_model=FundraisingSummaryDB)
+async def get_fundraising_stats(
+        session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Возвращает итоги сбора средств: собрано пожертвований, требуется
+    проектам, открытых проектов, остаток до закрытия проектов
+    и нераспределённый остаток пожертвований.
+    Итоги хранятся одной строкой и не пересчитываются по проектам.
+    """
+    return await fundraising_summary_crud.get(session)
 
 
 @router.patch(
@@ -84,28 +162,68 @@ async def partially_update_charity_project(
     Только для суперюзеров.
     Закрытый проект нельзя редактировать;
     нельзя установить требуемую сумму меньше вложенной.
+    Условия проверяются в самом UPDATE; причина отказа выясняется
+    только после невыполненного обновления. Если проект из кеша
+    устарел, обновление повторяется один раз по актуальной строке.
     """
-    charity_project = await check_charity_project_exist(
-        charity_project_id=project_id,
-        session=session
-    )
-    check_project_is_close(charity_project_obj=charity_project)
-    if obj_in.name is not None:
-        await check_charity_project_name_duplicate(
-            charity_project_name=obj_in.name,
+    async def update() -> CharityProject:
+        charity_project = await check_charity_project_exist(
+            charity_project_id=project_id,
             session=session
         )
-    if obj_in.full_amount is not None:
-        check_full_amount_no_less_than_invested_amount(
-            invested_amount=charity_project.invested_amount,
-            new_full_amount=obj_in.full_amount,
+        updated_project = await update_charity_project(
+            charity_project=charity_project,
+            obj_in=obj_in,
+            session=session,
         )
-    charity_project = await charity_project_crud.update(
-        db_obj=charity_project,
-        obj_in=obj_in,
+        if updated_project is None:
+            charity_project = await check_charity_project_can_be_updated(
+                charity_project_id=project_id,
+                obj_in=obj_in,
+                session=session,
+            )
+            updated_project = await update_charity_project(
+                charity_project=charity_project,
+                obj_in=obj_in,
+                session=session,
+            )
+        if updated_project is None:
+            raise StaleDataError(CharityProject.__tablename__)
+        return updated_project
+
+    with check_charity_project_name_unique():
+        return await write_retry.run(update, session)
+
+
+@router.get(
+    '/{project_id}/investments',
+    response_model=List[InvestmentDB],
+    dependencies=[Depends(current_superuser)],
+)
+async def get_charity_project_investments(
+        project_id: int,
+        response: Response,
+        page: PageParams = Depends(),
+        session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Только для суперюзеров.
+    Возвращает переводы из пожертвований в проект в порядке создания,
+    с параметром limit — постранично, как у общих списков.
+    """
+    await check_charity_project_exist(
+        charity_project_id=project_id,
+        session=session
+    )
+    investments = await investment_crud.get_by_project(
+        project_id=project_id,
         session=session,
+        limit=page.limit,
+        after=page.after,
+        columns=INVESTMENT_COLUMNS,
     )
-    return charity_project
+    investments = paginate(response, investments, page)
+    return rows_response(investments, headers=response.headers)
 
 
 @router.delete(
@@ -122,14 +240,23 @@ async def remove_charity_project(
     Удаляет проект. Нельзя удалить проект, в который уже были инвестированы
     средства, его можно только закрыть.
     """
-    charity_project = await check_charity_project_exist(
-        charity_project_id=project_id,
-        session=session
-    )
-    check_project_invest_amount_is_empty(charity_project_obj=charity_project)
-    check_project_is_close(charity_project_obj=charity_project)
-    charity_project = await charity_project_crud.remove(
-        db_obj=charity_project,
-        session=session
-    )
-    return charity_project
+    async def remove() -> CharityProject:
+        charity_project = await check_charity_project_exist(
+            charity_project_id=project_id,
+            session=session
+        )
+        check_project_invest_amount_is_empty(
+            charity_project_obj=charity_project
+        )
+        check_project_is_close(charity_project_obj=charity_project)
+        try:
+            return await charity_project_crud.remove(
+                db_obj=charity_project,
+                session=session
+            )
+        except StaleDataError:
+            # Проект из кеша устарел: повтор проверит его по строке из БД.
+            project_cache.invalidate({project_id})
+            raise
+
+    return await write_retry.run(remove, session)
@@ -1,16 +1,39 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core import current_superuser, current_user, get_async_session
-from app.crud import charity_project_crud, donation_crud
-from app.services import investing_process
-from app.models import User
-from app.schemas import DonationDB, DonationCreate
+from app.api.pagination import CreatedRangeParams, PageParams, paginate
+from app.api.serialization import get_schema_columns, rows_response
+from app.api.streaming import accepts_ndjson, ndjson_response
+from app.api.validators import check_bulk_donations_size, check_donation_exist
+from app.core import (
+    current_superuser, current_user, get_async_session, get_read_session,
+    settings
+)
+from app.crud import (
+    donation_crud, investment_crud, user_donation_summary_crud
+)
+from app.services import allocation_worker, create_and_invest
+from app.models import Donation, Investment, User
+from app.schemas import (
+    DonationDB, DonationCreate, InvestmentDB, UserDonationSummaryDB
+)
 
 router = APIRouter()
 
+USER_DONATION_EXCLUDE = {
+    'user_id',
+    'invested_amount',
+    'fully_invested',
+    'close_date'
+}
+DONATION_COLUMNS = get_schema_columns(Donation, DonationDB)
+INVESTMENT_COLUMNS = get_schema_columns(Investment, InvestmentDB)
+USER_DONATION_COLUMNS = get_schema_columns(
+    Donation, DonationDB, exclude=USER_DONATION_EXCLUDE
+)
+
 
 @router.post(
     '/',
@@ -29,23 +52,54 @@ async def create_donation(
         user: User = Depends(current_user),
 ):
     """Сделать пожертвование."""
-    new_donation = await donation_crud.create(
-        obj_in=donation,
+    if allocation_worker.is_running:
+        return await allocation_worker.submit(
+            crud=donation_crud,
+            obj_in=donation,
+            schema=DonationDB,
+            user=user,
+        )
+    [new_donation] = await create_and_invest(
+        crud=donation_crud,
+        objs_in=[donation],
+        schema=DonationDB,
         session=session,
         user=user,
-        commit=False
-    )
-    session.add_all(
-        investing_process(
-            target=new_donation,
-            sources=await charity_project_crud.get_not_fully_invested(session),
-        )
     )
-    await session.commit()
-    await session.refresh(new_donation)
     return new_donation
 
 
+@router.post(
+    '/bulk',
+    response_model=List[DonationDB],
+    response_model_exclude={
+        'user_id',
+        'invested_amount',
+        'fully_invested',
+        'close_date'
+    },
+    response_model_exclude_none=True,
+)
+async def create_donations_bulk(
+        donations: List[DonationCreate],
+        session: AsyncSession = Depends(get_async_session),
+        user: User = Depends(current_user),
+):
+    """
+    Сделать несколько пожертвований одним запросом.
+    Пожертвования распределяются по проектам так же,
+    как при последовательной отправке, в одной транзакции.
+    """
+    check_bulk_donations_size(donations=donations)
+    return await create_and_invest(
+        crud=donation_crud,
+        objs_in=donations,
+        schema=DonationDB,
+        session=session,
+        user=user,
+    )
+
+
 @router.get(
     '/',
     response_model=List[DonationDB],
@@ -53,36 +107,117 @@ async def create_donation(
     dependencies=[Depends(current_superuser)],
 )
 async def get_all_donations(
-        session: AsyncSession = Depends(get_async_session),
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(),
+        session: AsyncSession = Depends(get_read_session),
 ):
     """
     Только для суперюзеров.
-    Возвращает список всех пожертвований.
+    Возвращает список всех пожертвований в порядке создания,
+    с параметром limit — постранично, с заголовком
+    Accept: application/x-ndjson — построчно по мере чтения из БД.
     """
-    all_donations = await donation_crud.get_multi(
-        session=session
+    if accepts_ndjson(request):
+        return ndjson_response(donation_crud.stream_page(
+            session=session,
+            yield_per=settings.export_yield_per,
+            limit=page.limit,
+            after=page.after,
+            columns=DONATION_COLUMNS,
+        ))
+    donations = await donation_crud.get_page(
+        session=session,
+        limit=page.limit,
+        after=page.after,
+        columns=DONATION_COLUMNS,
     )
-    return all_donations
+    donations = paginate(response, donations, page)
+    return rows_response(donations, headers=response.headers)
 
 
 @router.get(
     '/my',
     response_model_exclude_none=True,
-    response_model_exclude={
-        'user_id',
-        'invested_amount',
-        'fully_invested',
-        'close_date'
-    },
+    response_model_exclude=USER_DONATION_EXCLUDE,
     response_model=List[DonationDB]
 )
 async def get_user_donations(
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(),
+        created: CreatedRangeParams = Depends(),
         user: User = Depends(current_user),
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
 ):
-    """Возвращает список пожертвований пользователя, выполняющего запрос."""
+    """
+    Возвращает список пожертвований пользователя, выполняющего запрос.
+    Параметры created_from и created_to ограничивают период создания,
+    limit и after — постраничная выдача, как у общего списка.
+    """
+    if accepts_ndjson(request):
+        return ndjson_response(donation_crud.stream_by_user(
+            user=user,
+            session=session,
+            yield_per=settings.export_yield_per,
+            limit=page.limit,
+            after=page.after,
+            columns=USER_DONATION_COLUMNS,
+            created_from=created.created_from,
+            created_to=created.created_to,
+        ))
     user_donations = await donation_crud.get_by_user(
         user=user,
-        session=session
+        session=session,
+        limit=page.limit,
+        after=page.after,
+        columns=USER_DONATION_COLUMNS,
+        created_from=created.created_from,
+        created_to=created.created_to,
+    )
+    user_donations = paginate(response, user_donations, page)
+    return rows_response(user_donations, headers=response.headers)
+
+
+@router.get('/my/summary', response_model=UserDonationSummaryDB)
+async def get_user_donation_summary(
+        user: User = Depends(current_user),
+        session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Возвращает число пожертвований пользователя, выполняющего запрос,
+    их общую сумму и распределённую по проектам часть.
+    Счётчики хранятся отдельной строкой и не пересчитываются
+    по пожертвованиям.
+    """
+    return await user_donation_summary_crud.get_by_user(
+        user=user, session=session
+    )
+
+
+@router.get(
+    '/{donation_id}/investments',
+    response_model=List[InvestmentDB],
+    dependencies=[Depends(current_superuser)],
+)
+async def get_donation_investments(
+        donation_id: int,
+        response: Response,
+        page: PageParams = Depends(),
+        session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Только для суперюзеров.
+    Возвращает переводы из пожертвования в проекты в порядке создания,
+    с параметром limit — постранично, как у общих списков.
+    """
+    await check_donation_exist(donation_id=donation_id, session=session)
+    investments = await investment_crud.get_by_donation(
+        donation_id=donation_id,
+        session=session,
+        limit=page.limit,
+        after=page.after,
+        columns=INVESTMENT_COLUMNS,
     )
-    return user_donations
+    investments = paginate(response, investments, page)
+    return rows_response(investments, headers=response.headers)
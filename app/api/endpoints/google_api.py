@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import GOOGLE_TABLE_LINK
-from app.core import current_superuser, get_async_session, get_service
+from app.core import current_superuser, get_read_session, get_service
 from app.crud import charity_project_crud
 from app.services.google_api import (
     spreadsheets_create, set_user_permissions, spreadsheets_update_value
@@ -21,7 +21,7 @@ router = APIRouter()
     dependencies=[Depends(current_superuser)]
 )
 async def get_report(
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         wrapper_services: Aiogoogle = Depends(get_service)
 ):
     """
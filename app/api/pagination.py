@@ -0,0 +1,103 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime as dt
+from http import HTTPStatus
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy.engine import Row
+
+from app.constants import MAX_PAGE_SIZE
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+INVALID_CURSOR_ERROR_MESSAGE = 'Некорректный курсор страницы!'
+INVALID_DATE_RANGE_ERROR_MESSAGE = (
+    'Начало периода должно быть раньше его конца!'
+)
+
+
+class PageParams:
+    """
+    Параметры постраничной выдачи: размер страницы и курсор,
+    полученный в заголовке X-Next-Cursor предыдущей страницы.
+    Без limit список возвращается целиком.
+    """
+
+    def __init__(
+            self,
+            limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+            after: Optional[str] = None,
+    ):
+        self.limit = limit
+        self.after = decode_cursor(after) if after is not None else None
+
+
+def to_local_time(value: Optional[dt]) -> Optional[dt]:
+    """
+    Дата со смещением UTC в местном времени без смещения:
+    так хранится дата создания объектов.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+class CreatedRangeParams:
+    """
+    Отбор по дате создания: с created_from включительно
+    до created_to не включая. Даты со смещением UTC переводятся
+    в местное время.
+    """
+
+    def __init__(
+            self,
+            created_from: Optional[dt] = None,
+            created_to: Optional[dt] = None,
+    ):
+        created_from = to_local_time(created_from)
+        created_to = to_local_time(created_to)
+        if (
+            created_from is not None and created_to is not None and
+            created_from >= created_to
+        ):
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail=INVALID_DATE_RANGE_ERROR_MESSAGE
+            )
+        self.created_from = created_from
+        self.created_to = created_to
+
+
+def encode_cursor(row: Row) -> str:
+    """Непрозрачный курсор из ключа сортировки (create_date, id)."""
+    key = f'{row.create_date.isoformat()}|{row.id}'
+    return urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[dt, int]:
+    """Ключ сортировки из курсора, некорректный курсор — ошибка 422."""
+    try:
+        create_date, obj_id = urlsafe_b64decode(
+            cursor.encode()
+        ).decode().split('|')
+        return dt.fromisoformat(create_date), int(obj_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=INVALID_CURSOR_ERROR_MESSAGE
+        )
+
+
+def paginate(
+        response: Response,
+        rows: List[Row],
+        page: PageParams,
+) -> List[Row]:
+    """
+    Обрезка выборки до размера страницы. Если за страницей есть ещё
+    строки, курсор следующей страницы передаётся в заголовке.
+    """
+    if page.limit is None or len(rows) <= page.limit:
+        return rows
+    rows = rows[:page.limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1])
+    return rows
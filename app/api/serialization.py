@@ -0,0 +1,44 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Column
+from sqlalchemy.engine import Row
+
+from app.core import Base
+
+
+def get_schema_columns(
+        model: Base,
+        schema: BaseModel,
+        exclude: Iterable[str] = (),
+) -> List[Column]:
+    """Столбцы модели в порядке полей схемы ответа."""
+    return [
+        getattr(model, name)
+        for name in schema.__fields__
+        if name not in exclude
+    ]
+
+
+def get_row_content(row: Row) -> Dict[str, Any]:
+    """
+    Содержимое строки выборки для ответа. Поля со значением None
+    опускаются, как при response_model_exclude_none.
+    """
+    return {
+        key: value for key, value in row._mapping.items() if value is not None
+    }
+
+
+def rows_response(
+        rows: List[Row],
+        headers: Optional[Mapping[str, str]] = None,
+) -> ORJSONResponse:
+    """
+    Ответ со списком строк без повторной валидации схемой: строки
+    выбраны из БД по столбцам схемы и кодируются orjson напрямую.
+    """
+    return ORJSONResponse(
+        [get_row_content(row) for row in rows], headers=headers
+    )
@@ -0,0 +1,33 @@
+from contextlib import aclosing
+from typing import AsyncIterator, Mapping, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.api.serialization import get_row_content
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Клиент запросил выгрузку построчным JSON."""
+    return NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
+
+
+def ndjson_response(
+        rows: AsyncIterator,
+        headers: Optional[Mapping[str, str]] = None,
+) -> StreamingResponse:
+    """
+    Потоковый ответ: каждая строка выборки отправляется отдельной
+    строкой JSON, как только прочитана из БД.
+    """
+    async def lines():
+        async with aclosing(rows):
+            async for row in rows:
+                yield orjson.dumps(get_row_content(row)) + b'\n'
+
+    return StreamingResponse(
+        lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers
+    )
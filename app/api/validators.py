@@ -1,13 +1,21 @@
+from contextlib import contextmanager
 from http import HTTPStatus
+from typing import Iterator, List
 
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.constants import MAX_BULK_DONATIONS
 from app.crud.charity_project import charity_project_crud
-from app.models import CharityProject
+from app.crud.donation import donation_crud
+from app.models import CharityProject, Donation
+from app.schemas import CharityProjectUpdate, DonationCreate
+from app.services.project_cache import get_cached_project
 
 DUPLICATE_PROJECT_NAME_ERROR_MESSAGE = 'Проект с таким именем уже существует!'
 PROJECT_NOT_FOUND_ERROR_MESSAGE = 'Проект не найден!'
+DONATION_NOT_FOUND_ERROR_MESSAGE = 'Пожертвование не найдено!'
 NO_DELETION_FOR_INVESTED_PROJECT_ERROR_MESSAGE = (
     'В проект были внесены средства, не подлежит удалению!'
 )
@@ -15,18 +23,25 @@ NO_UPDATING_FOR_CLOSED_PROJECT = 'Закрытый проект нельзя р
 FULL_AMOUNT_NO_LESS_THAN_INVESTED_AMOUNT_ERROR_MESSAGE = (
     'Новая требуемая сумма должна быть не меньше старой!'
 )
+BULK_DONATIONS_SIZE_ERROR_MESSAGE = (
+    'В пакете должно быть от 1 до {max_size} пожертвований!'
+)
 
 
-async def check_charity_project_name_duplicate(
-        charity_project_name: str,
-        session: AsyncSession,
-) -> None:
-    """Проверка названия проекта на дублирование."""
-    charity_project_id = await charity_project_crud.get_project_id_by_name(
-        charity_project_name=charity_project_name,
-        session=session
-    )
-    if charity_project_id is not None:
+@contextmanager
+def check_charity_project_name_unique() -> Iterator[None]:
+    """
+    Проверка названия проекта ограничением уникальности при записи:
+    нарушение уникального индекса названия превращается в ошибку 400.
+    Проверка не требует отдельного запроса и не зависит от гонки
+    между проверкой и вставкой.
+    """
+    try:
+        yield
+    except IntegrityError as error:
+        message = str(error.orig)
+        if 'unique' not in message.lower() or 'name' not in message:
+            raise
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail=DUPLICATE_PROJECT_NAME_ERROR_MESSAGE
@@ -38,18 +53,65 @@ async def check_charity_project_exist(
         session: AsyncSession,
 ) -> CharityProject:
     """Проверка на наличие проекта в БД."""
+    charity_project = await get_cached_project(
+        project_id=charity_project_id,
+        session=session
+    )
+    if charity_project is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=PROJECT_NOT_FOUND_ERROR_MESSAGE
+        )
+    return charity_project
+
+
+async def check_charity_project_can_be_updated(
+        charity_project_id: int,
+        obj_in: CharityProjectUpdate,
+        session: AsyncSession,
+) -> CharityProject:
+    """
+    Выяснение, почему условное обновление проекта не выполнилось:
+    проект перечитывается из БД и проверяется на наличие, закрытие
+    и новую требуемую сумму. Если проверки прошли, возвращается
+    актуальный проект.
+    """
     charity_project = await charity_project_crud.get(
         obj_id=charity_project_id,
-        session=session
+        session=session,
+        populate_existing=True,
     )
     if charity_project is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail=PROJECT_NOT_FOUND_ERROR_MESSAGE
         )
+    check_project_is_close(charity_project_obj=charity_project)
+    if 'full_amount' in obj_in.__fields_set__:
+        check_full_amount_no_less_than_invested_amount(
+            invested_amount=charity_project.invested_amount,
+            new_full_amount=obj_in.full_amount,
+        )
     return charity_project
 
 
+async def check_donation_exist(
+        donation_id: int,
+        session: AsyncSession,
+) -> Donation:
+    """Проверка на наличие пожертвования в БД."""
+    donation = await donation_crud.get(
+        obj_id=donation_id,
+        session=session
+    )
+    if donation is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=DONATION_NOT_FOUND_ERROR_MESSAGE
+        )
+    return donation
+
+
 def check_project_invest_amount_is_empty(
         charity_project_obj: CharityProject
 ) -> None:
@@ -80,3 +142,14 @@ def check_full_amount_no_less_than_invested_amount(
             status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
             detail=FULL_AMOUNT_NO_LESS_THAN_INVESTED_AMOUNT_ERROR_MESSAGE
         )
+
+
+def check_bulk_donations_size(donations: List[DonationCreate]) -> None:
+    """Проверка размера пакета пожертвований."""
+    if not 0 < len(donations) <= MAX_BULK_DONATIONS:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=BULK_DONATIONS_SIZE_ERROR_MESSAGE.format(
+                max_size=MAX_BULK_DONATIONS
+            )
+        )
@@ -5,4 +5,6 @@ MAX_LENGTH_PROJECT_NAME = 100
 MIN_LENGTH_PROJECT_NAME = 1
 MIN_LENGTH_PROJECT_DESCRIPTION = 1
 ROW_COUNT = 100
+MAX_BULK_DONATIONS = 5000
+MAX_PAGE_SIZE = 1000
 COLUMN_COUNT = 3
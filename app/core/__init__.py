@@ -1,6 +1,6 @@
 """Для доступа ко всем основным функциям в проекте."""
 from .config import settings  # noqa
-from .db import Base, get_async_session  # noqa
+from .db import Base, get_async_session, get_read_session  # noqa
 from .google_client import get_service  # noqa
 from .init_db import create_first_superuser  # noqa
 from .user import current_superuser, current_user  # noqa
@@ -1,13 +1,16 @@
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseSettings, EmailStr
+from pydantic import BaseSettings, EmailStr, root_validator, validator
+
+DEFAULT_DATABASE_URL = 'sqlite+aiosqlite:///./cat_foundation.db'
 
 
 class Settings(BaseSettings):
     """Настройки проекта."""
     app_title: str = 'QRKot'
     app_description: str = 'Благотворительный фонд поддержки котиков'
-    database_url: str = 'sqlite+aiosqlite:///./cat_foundation.db'
+    database_url: str = DEFAULT_DATABASE_URL
+    read_database_url: str = DEFAULT_DATABASE_URL
     first_superuser_email: Optional[EmailStr] = None
     first_superuser_password: Optional[str] = None
     secret: str = 'secret'
@@ -22,9 +25,66 @@ class Settings(BaseSettings):
     auth_provider_x509_cert_url: Optional[str] = None
     client_x509_cert_url: Optional[str] = None
     email: Optional[str] = None
+    investing_engine: Literal['python', 'sql'] = 'python'
+    investing_sources: Literal['ledger', 'stream'] = 'ledger'
+    investing_yield_per: int = 20
+    allocation_worker: bool = False
+    allocation_batch_size: int = 100
+    write_retries: int = 10
+    write_retry_delay: float = 0.01
+    write_retry_max_delay: float = 0.2
+    write_retry_deadline: float = 2.0
+    write_retry_busy_timeout: int = 100
+    export_yield_per: int = 500
+    project_list_cache_control: str = 'public, no-cache'
+    project_cache_size: int = 1024
+    project_cache_ttl: float = 5.0
+    cache_invalidation_transport: Literal[
+        'auto', 'none', 'version', 'sqlite'
+    ] = 'auto'
+    cache_invalidation_interval: float = 1.0
+    user_cache_size: int = 1024
+    user_cache_ttl: float = 30.0
+    password_hash_rounds: int = 12
+    password_hash_concurrency: int = 4
+    engine_pool_size: Optional[int] = None
+    engine_max_overflow: int = 10
+    engine_query_cache_size: int = 500
+    sqlite_busy_timeout: int = 5000
+    sqlite_journal_mode: Optional[Literal[
+        'delete', 'truncate', 'persist', 'memory', 'wal', 'off'
+    ]] = None
+    sqlite_synchronous: Optional[Literal[
+        'off', 'normal', 'full', 'extra'
+    ]] = None
+    sqlite_mmap_size: Optional[int] = None
+    sqlite_cache_size: Optional[int] = None
 
     class Config:
         env_file = '.env'
 
+    @root_validator(pre=True)
+    def read_from_main_database_by_default(cls, values):
+        """Без отдельного адреса для чтения читается основная БД."""
+        values.setdefault(
+            'read_database_url',
+            values.get('database_url', DEFAULT_DATABASE_URL),
+        )
+        return values
+
+    @validator('write_retry_busy_timeout')
+    def busy_timeout_within_deadline(cls, value, values):
+        """
+        Блокировка SQLite должна освобождать попытку раньше, чем кончится
+        время на повторы, иначе первая же блокировка исчерпает его.
+        """
+        deadline = values.get('write_retry_deadline')
+        if deadline is not None and value >= deadline * 1000:
+            raise ValueError(
+                'WRITE_RETRY_BUSY_TIMEOUT должен быть меньше '
+                'WRITE_RETRY_DEADLINE.'
+            )
+        return value
+
 
 settings = Settings()
@@ -1,8 +1,21 @@
-from sqlalchemy import Column, Integer
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import Any, Dict, Mapping
+
+from sqlalchemy import Column, Integer, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, create_async_engine
+)
 from sqlalchemy.orm import declarative_base, declared_attr, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import Settings, settings
 
-from app.core.config import settings
+SQLITE_PRAGMAS = (
+    'busy_timeout', 'journal_mode', 'synchronous', 'mmap_size', 'cache_size'
+)
+# Режим журнала меняется записью в файл БД, а соединения
+# только для чтения писать не могут.
+READ_ONLY_SKIPPED_PRAGMAS = ('journal_mode',)
 
 
 class PreBase:
@@ -15,12 +28,116 @@ class PreBase:
 
 Base = declarative_base(cls=PreBase)
 
-engine = create_async_engine(settings.database_url)
 
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession)
+def get_engine_options(settings: Settings) -> Dict[str, Any]:
+    """
+    Параметры движка из настроек. Пул задаётся явно только вместе
+    с размером: для файла SQLite по умолчанию соединения не хранятся.
+    """
+    options = {'query_cache_size': settings.engine_query_cache_size}
+    if settings.engine_pool_size is not None:
+        options.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.engine_pool_size,
+            max_overflow=settings.engine_max_overflow,
+        )
+    return options
+
+
+def get_sqlite_pragmas(settings: Settings) -> Dict[str, Any]:
+    """Заданные в настройках PRAGMA соединений SQLite."""
+    pragmas = {
+        pragma: getattr(settings, f'sqlite_{pragma}')
+        for pragma in SQLITE_PRAGMAS
+    }
+    return {
+        pragma: value for pragma, value in pragmas.items()
+        if value is not None
+    }
+
+
+def get_write_pragmas(settings: Settings) -> Dict[str, Any]:
+    """
+    PRAGMA соединений записи. Когда транзакции записи повторяются,
+    блокировку ждёт слой повторов: SQLite ждёт её не дольше
+    write_retry_busy_timeout, и до конца времени на запрос успевает
+    пройти несколько попыток.
+    """
+    pragmas = get_sqlite_pragmas(settings)
+    if settings.write_retries:
+        pragmas['busy_timeout'] = settings.write_retry_busy_timeout
+    return pragmas
+
+
+def set_sqlite_pragmas(
+        engine: AsyncEngine,
+        pragmas: Mapping[str, Any],
+) -> None:
+    """Установка PRAGMA на каждом новом соединении движка SQLite."""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+        cursor.close()
+
+
+def get_read_only_url(url: str) -> URL:
+    """
+    Адрес БД для чтения. Файл SQLite открывается в режиме mode=ro:
+    такие соединения не пишут и не занимают блокировку записи.
+    Адреса других СУБД (реплика) остаются как есть.
+    """
+    url = make_url(url)
+    if (
+        url.get_backend_name() != 'sqlite' or
+        url.database in (None, '', ':memory:') or
+        url.database.startswith('file:')
+    ):
+        return url
+    return url.set(
+        database=f'file:{url.database}',
+        query={**url.query, 'mode': 'ro', 'uri': 'true'},
+    )
+
+
+engine = create_async_engine(
+    settings.database_url, **get_engine_options(settings)
+)
+set_sqlite_pragmas(engine, get_write_pragmas(settings))
+
+# Отдельный движок для GET-запросов: долгие чтения не занимают
+# соединения писателей.
+read_engine = create_async_engine(
+    get_read_only_url(settings.read_database_url),
+    **get_engine_options(settings),
+)
+set_sqlite_pragmas(read_engine, {
+    pragma: value
+    for pragma, value in get_sqlite_pragmas(settings).items()
+    if pragma not in READ_ONLY_SKIPPED_PRAGMAS
+})
+
+# Объекты остаются загруженными после фиксации: ответы собираются
+# из них без повторного чтения из БД.
+AsyncSessionLocal = sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 
 async def get_async_session():
     """Асинхронный генератор сессий."""
     async with AsyncSessionLocal() as async_session:
         yield async_session
+
+
+async def get_read_session():
+    """Асинхронный генератор сессий только для чтения."""
+    async with ReadSessionLocal() as async_session:
+        yield async_session
@@ -1,17 +1,26 @@
-from typing import Optional, Union
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
+import jwt
 from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import (
-    BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException
+    BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException,
+    exceptions
 )
 from fastapi_users.authentication import (
     AuthenticationBackend, BearerTransport, JWTStrategy
 )
+from fastapi_users.jwt import decode_jwt
+from fastapi_users.password import PasswordHelper
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.db import get_async_session
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.user import UserCreate
 
@@ -22,8 +31,46 @@ async def get_user_db(session: AsyncSession = Depends(get_async_session)):
 bearer_transport = BearerTransport(tokenUrl='auth/jwt/login')
 
 
+class CachedJWTStrategy(JWTStrategy):
+    """
+    JWT-стратегия с кешем пользователей по subject токена.
+    Подпись и срок действия токена проверяются в каждом запросе,
+    а пользователь читается из БД только при промахе кеша.
+    """
+
+    async def read_token(
+        self,
+        token: Optional[str],
+        user_manager: BaseUserManager[User, int]
+    ) -> Optional[User]:
+        if token is None:
+            return None
+        try:
+            data = decode_jwt(
+                token,
+                self.decode_key,
+                self.token_audience,
+                algorithms=[self.algorithm],
+            )
+        except jwt.PyJWTError:
+            return None
+        subject = data.get('user_id')
+        if subject is None:
+            return None
+        user = user_cache.get(subject)
+        if user is not None:
+            return user
+        generation = user_cache.generation
+        try:
+            user = await user_manager.get(user_manager.parse_id(subject))
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+        user_cache.put(subject, user, generation)
+        return user
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=settings.secret, lifetime_seconds=3600)
+    return CachedJWTStrategy(secret=settings.secret, lifetime_seconds=3600)
 
 
 auth_backend = AuthenticationBackend(
@@ -33,7 +80,54 @@ auth_backend = AuthenticationBackend(
 )
 
 
+class ThreadPoolPasswordHelper(PasswordHelper):
+    """
+    Хеширование и проверка паролей bcrypt в ограниченном пуле потоков.
+    Расчёт хеша занимает десятки миллисекунд и в цикле событий
+    задерживал бы все одновременные запросы; пул ограничивает число
+    одновременных расчётов. При concurrency=0 пароли хешируются
+    в цикле событий.
+    """
+
+    def __init__(self, rounds: int, concurrency: int):
+        super().__init__(CryptContext(
+            schemes=['bcrypt'], deprecated='auto', bcrypt__rounds=rounds
+        ))
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='password-hash'
+        ) if concurrency else None
+
+    async def _run(self, func: Callable, *args):
+        if self.executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, func, *args
+        )
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run(self.hash, password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await self._run(
+            self.verify_and_update, plain_password, hashed_password
+        )
+
+
+password_helper = ThreadPoolPasswordHelper(
+    rounds=settings.password_hash_rounds,
+    concurrency=settings.password_hash_concurrency,
+)
+
+
 class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
+    """
+    Менеджер пользователей. Создание, вход и смена пароля повторяют
+    fastapi-users, но хешируют пароли вне цикла событий.
+    """
+    password_helper: ThreadPoolPasswordHelper
+
     async def validate_password(
         self,
         password: str,
@@ -53,9 +147,63 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     ) -> None:
         print(f'Пользователь {user.email} зарегистрирован.')
 
+    async def create(
+        self,
+        user_create: UserCreate,
+        safe: bool = False,
+        request: Optional[Request] = None,
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+        if await self.user_db.get_by_email(user_create.email) is not None:
+            raise exceptions.UserAlreadyExists()
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        user_dict['hashed_password'] = await self.password_helper.hash_async(
+            user_dict.pop('password')
+        )
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(
+        self, credentials: OAuth2PasswordRequestForm
+    ) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Хеш считается и для неизвестного e-mail, чтобы время
+            # ответа не выдавало, зарегистрирован ли адрес.
+            await self.password_helper.hash_async(credentials.password)
+            return None
+        verified, updated_password_hash = (
+            await self.password_helper.verify_and_update_async(
+                credentials.password, user.hashed_password
+            )
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(
+                user, {'hashed_password': updated_password_hash}
+            )
+        return user
+
+    async def _update(self, user: User, update_dict: Dict[str, Any]) -> User:
+        if 'password' in update_dict:
+            update_dict = dict(update_dict)
+            password = update_dict.pop('password')
+            await self.validate_password(password, user)
+            update_dict['hashed_password'] = (
+                await self.password_helper.hash_async(password)
+            )
+        return await super()._update(user, update_dict)
+
 
 async def get_user_manager(user_db=Depends(get_user_db)):
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_helper)
 
 
 fastapi_users = FastAPIUsers[User, int](
@@ -0,0 +1,89 @@
+from collections import Counter
+from typing import Iterable, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+USER_CHANGES_KEY = 'user_cache_changes'
+ALL_USERS = None
+
+
+class UserCache:
+    """
+    Кеш процесса для пользователей, найденных по subject JWT-токена.
+    Размер ограничен, устаревшие записи вытесняются по LRU и по TTL.
+    Записи сбрасываются после фиксации транзакций, изменивших
+    пользователей; изменения из других процессов сбрасывают кеш
+    по сигналу шины invalidation_bus, без неё — видны не позже TTL.
+    Каждый сброс увеличивает поколение кеша: пользователь, прочитанный
+    из БД до сброса, в кеш уже не попадает.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.users = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.stats = Counter()
+        self.generation = 0
+
+    def get(self, subject: str) -> Optional[User]:
+        """
+        Пользователь из снимка столбцов. Каждому запросу достаётся
+        свой отсоединённый объект, который можно подключить к сессии.
+        """
+        snapshot = self.users.get(subject)
+        if snapshot is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, subject: str, user: User, generation: int) -> None:
+        if generation != self.generation:
+            return
+        self.users[subject] = {
+            column.key: getattr(user, column.key)
+            for column in inspect(User).column_attrs
+        }
+
+    def invalidate(self, user_ids: Optional[Iterable[int]] = ALL_USERS):
+        """Сброс снимков пользователей, без списка id — всех."""
+        self.stats['invalidations'] += 1
+        self.generation += 1
+        if user_ids is ALL_USERS:
+            self.users.clear()
+            return
+        for user_id in user_ids:
+            self.users.pop(str(user_id), None)
+
+
+user_cache = UserCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl,
+)
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_user_changes(session, flush_context):
+    """Сбор id пользователей, записанных в транзакции."""
+    changes = session.info.get(USER_CHANGES_KEY, set())
+    for objs in session.dirty, session.deleted:
+        changes.update(obj.id for obj in objs if isinstance(obj, User))
+    if changes:
+        session.info[USER_CHANGES_KEY] = changes
+
+
+@event.listens_for(Session, 'after_commit')
+def apply_user_changes(session):
+    """Сброс кеша после фиксации изменений пользователей."""
+    if USER_CHANGES_KEY in session.info:
+        user_cache.invalidate(session.info.pop(USER_CHANGES_KEY))
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_user_changes(session):
+    session.info.pop(USER_CHANGES_KEY, None)
@@ -1,4 +1,8 @@
 """Для доступа ко всем CRUD-функциям в проекте."""
 from .base import CRUDBase # noqa
 from .charity_project import charity_project_crud # noqa
+from .data_version import data_version_crud # noqa
 from .donation import donation_crud # noqa
+from .fundraising_summary import fundraising_summary_crud # noqa
+from .investment import investment_crud # noqa
+from .user_donation_summary import user_donation_summary_crud # noqa
@@ -1,26 +1,102 @@
-from typing import Optional
+from typing import AsyncIterator, List, Mapping, Optional, Tuple, Union
 from datetime import datetime as dt
 
-from sqlalchemy import asc, select
+from sqlalchemy import Column, Table, asc, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
 from app.models import User
 
+SKIP_LOCKED_DIALECTS = ('postgresql', 'mysql', 'oracle')
+UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def add_to_counters(
+        connection: Connection,
+        table: Table,
+        key: List[str],
+        rows: Union[Mapping, Select],
+) -> None:
+    """
+    Прибавление приращений к строкам счётчиков с уникальным ключом key.
+    rows — словарь одной строки или выборка строк с ключом и приращениями.
+    Отсутствующие строки создаются из приращений. Где БД поддерживает
+    INSERT … ON CONFLICT, это один запрос.
+    """
+    if isinstance(rows, Select):
+        fields = list(rows.selected_columns.keys())
+    else:
+        fields = list(rows)
+    upsert_insert = UPSERT_INSERTS.get(connection.dialect.name)
+    if upsert_insert is None:
+        if isinstance(rows, Select):
+            rows = [row._asdict() for row in connection.execute(rows)]
+        else:
+            rows = [rows]
+        for row in rows:
+            added = connection.execute(
+                update(table).where(
+                    *(table.c[column] == row[column] for column in key)
+                ).values({
+                    table.c[field]: table.c[field] + row[field]
+                    for field in fields if field not in key
+                })
+            )
+            if not added.rowcount:
+                connection.execute(insert(table).values(**row))
+        return
+    statement = upsert_insert(table)
+    if isinstance(rows, Select):
+        statement = statement.from_select(fields, rows)
+    else:
+        statement = statement.values(**rows)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=key,
+        set_={
+            field: table.c[field] + statement.excluded[field]
+            for field in fields if field not in key
+        },
+    ))
+
 
 class CRUDBase:
     def __init__(self, model):
         self.model = model
 
+    @staticmethod
+    def lock_for_allocation(
+            query,
+            session: AsyncSession,
+            skip_locked: bool = True,
+    ):
+        """
+        На БД с поддержкой SKIP LOCKED строки блокируются до конца
+        транзакции, а занятые другими транзакциями пропускаются.
+        Без skip_locked занятые строки ожидаются.
+        """
+        if session.bind.dialect.name in SKIP_LOCKED_DIALECTS:
+            return query.with_for_update(skip_locked=skip_locked)
+        return query
+
     async def get(
             self,
             obj_id: int,
             session: AsyncSession,
+            populate_existing: bool = False,
     ):
-        """Получение объекта по его id."""
+        """
+        Получение объекта по его id. С populate_existing объект,
+        уже загруженный в сессию, перечитывается из БД.
+        """
         db_obj = await session.execute(
             select(self.model).where(
                 self.model.id == obj_id
-            )
+            ).execution_options(populate_existing=populate_existing)
         )
         return db_obj.scalars().first()
 
@@ -30,6 +106,77 @@ class CRUDBase:
         db_objs = db_objs.scalars().all()
         return db_objs
 
+    def get_page_query(
+            self,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[dt, int]] = None,
+            *criteria,
+            columns: Optional[List[Column]] = None,
+    ):
+        """
+        Запрос объектов в порядке (create_date, id) после ключа after.
+        Если переданы столбцы, выбираются только они, без ORM-объектов.
+        """
+        query = select(*columns) if columns else select(self.model)
+        query = query.where(*criteria).order_by(
+            asc(self.model.create_date), asc(self.model.id)
+        )
+        if after is not None:
+            query = query.where(
+                tuple_(self.model.create_date, self.model.id) > after
+            )
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    async def get_page(
+            self,
+            session: AsyncSession,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[dt, int]] = None,
+            *criteria,
+            columns: Optional[List[Column]] = None,
+    ):
+        """
+        Получение объектов в порядке (create_date, id), начиная после
+        ключа after. Возвращается до limit + 1 объекта: лишний объект
+        показывает, что следующая страница существует.
+        Если переданы столбцы, возвращаются строки с ними.
+        """
+        query = self.get_page_query(
+            None if limit is None else limit + 1, after, *criteria,
+            columns=columns,
+        )
+        if columns:
+            return (await session.execute(query)).all()
+        return (await session.scalars(query)).all()
+
+    async def stream_page(
+            self,
+            session: AsyncSession,
+            yield_per: int,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[dt, int]] = None,
+            *criteria,
+            columns: Optional[List[Column]] = None,
+    ) -> AsyncIterator:
+        """
+        Потоковое получение объектов в порядке (create_date, id).
+        Строки читаются из серверного курсора пачками по yield_per штук.
+        """
+        query = self.get_page_query(
+            limit, after, *criteria, columns=columns
+        ).execution_options(yield_per=yield_per)
+        if columns:
+            db_objs = await session.stream(query)
+        else:
+            db_objs = await session.stream_scalars(query)
+        try:
+            async for db_obj in db_objs:
+                yield db_obj
+        finally:
+            await db_objs.close()
+
     async def create(
             self,
             obj_in,
@@ -45,41 +192,111 @@ class CRUDBase:
         session.add(db_obj)
         if commit:
             await session.commit()
-            await session.refresh(db_obj)
         return db_obj
 
+    async def create_multi(
+            self,
+            objs_in,
+            session: AsyncSession,
+            user: Optional[User] = None,
+    ):
+        """
+        Создание нескольких объектов без фиксации транзакции.
+        Объекты записываются при синхронизации сессии. SQLAlchemy 1.4
+        объединяет их в executemany, только если драйвер возвращает
+        первичные ключи пачки (psycopg2 в режиме values_plus_batch);
+        иначе, в том числе на SQLite, каждый объект вставляется отдельным
+        INSERT в той же транзакции.
+        """
+        db_objs = []
+        for obj_in in objs_in:
+            obj_in_data = obj_in.dict()
+            if user is not None:
+                obj_in_data['user_id'] = user.id
+            db_objs.append(self.model(**obj_in_data))
+        session.add_all(db_objs)
+        return db_objs
+
     async def get_not_fully_invested(
             self,
             session: AsyncSession
     ):
         """Получение из БД всех незакрытых объектов с сортировкой по дате."""
         not_fully_invested_objs = await session.scalars(
-            select(self.model).where(
-                self.model.fully_invested.is_(False)
-            ).order_by(asc('create_date'))
+            self.lock_for_allocation(
+                select(self.model).where(
+                    self.model.fully_invested.is_(False)
+                ).order_by(asc('create_date')),
+                session
+            )
         )
         return not_fully_invested_objs.all()
 
-    @staticmethod
-    async def update(
-            db_obj,
-            obj_in,
+    async def stream_not_fully_invested(
+            self,
             session: AsyncSession,
+            yield_per: int,
+    ) -> AsyncIterator:
+        """
+        Потоковое получение незакрытых объектов с сортировкой по дате.
+        Строки читаются из курсора пачками по yield_per штук, пока
+        потребитель не прекратит итерацию.
+        """
+        not_fully_invested_objs = await session.stream_scalars(
+            self.lock_for_allocation(
+                select(self.model).where(
+                    self.model.fully_invested.is_(False)
+                ).order_by(
+                    asc('create_date'), asc('id')
+                ).execution_options(yield_per=yield_per),
+                session
+            )
+        )
+        try:
+            async for db_obj in not_fully_invested_objs:
+                yield db_obj
+        finally:
+            await not_fully_invested_objs.close()
+
+    async def get_open_capacity(
+            self,
+            session: AsyncSession
+    ) -> List[Tuple[int, dt, int]]:
+        """
+        Получение id, даты создания и остатка до закрытия
+        всех незакрытых объектов без загрузки ORM-объектов.
+        """
+        open_capacity = await session.execute(
+            select(
+                self.model.id,
+                self.model.create_date,
+                self.model.full_amount - self.model.invested_amount
+            ).where(
+                self.model.fully_invested.is_(False)
+            )
+        )
+        return open_capacity.all()
+
+    async def get_by_ids(
+            self,
+            obj_ids: List[int],
+            session: AsyncSession
     ):
-        """Обновление объекта."""
-        update_data = obj_in.dict(exclude_unset=True)
-        if (
-            'full_amount' in update_data and
-            update_data['full_amount'] == db_obj.invested_amount
-        ):
-            update_data['fully_invested'] = True
-            update_data['close_data'] = dt.now()
-        for field in update_data:
-            setattr(db_obj, field, update_data[field])
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
-        return db_obj
+        """
+        Получение объектов по списку id с сортировкой по дате.
+        Строки нужны именно эти, поэтому занятые другими транзакциями
+        не пропускаются, а ожидаются.
+        """
+        db_objs = await session.scalars(
+            self.lock_for_allocation(
+                select(self.model).where(
+                    self.model.id.in_(obj_ids)
+                ).order_by(asc('create_date'), asc('id')),
+                session,
+                skip_locked=False,
+            )
+        )
+        return db_objs.all()
 
     @staticmethod
     async def remove(
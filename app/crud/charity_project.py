@@ -1,28 +1,18 @@
-from typing import List, Optional
+from datetime import datetime as dt
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.crud import CRUDBase
 from app.models import CharityProject
+from app.models.charity_project import normalize_project_name
 
 
 class CRUDCharityProject(CRUDBase):
     """Класс для CRUD-операций с проектом пожертвований."""
-    @staticmethod
-    async def get_project_id_by_name(
-            charity_project_name: str,
-            session: AsyncSession,
-    ) -> Optional[int]:
-        """Получение проекта пожертвований по его названию."""
-        charity_project_id = await session.execute(
-            select(CharityProject.id).where(
-                CharityProject.name == charity_project_name
-            )
-        )
-        charity_project_id = charity_project_id.scalars().first()
-        return charity_project_id
-
     @staticmethod
     async def get_projects_by_completion_rate(
             session: AsyncSession
@@ -45,5 +35,48 @@ class CRUDCharityProject(CRUDBase):
         )
         return closed_projects.all()
 
+    @staticmethod
+    async def update_open(
+            charity_project: CharityProject,
+            obj_in: BaseModel,
+            session: AsyncSession,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Обновление незакрытого проекта одним условным UPDATE.
+        Условия записи проверяются в WHERE: проект не закрыт, новая
+        требуемая сумма не меньше вложенной, версия строки совпадает
+        с прочитанной. Поэтому проверка и запись не разделены гонкой,
+        а остальные столбцы строки совпадают с прочитанными, и ответ
+        собирается без повторного чтения.
+        Возвращает записанные значения или None, если условия
+        не выполнились.
+        """
+        values = obj_in.dict(exclude_unset=True)
+        criteria = [
+            CharityProject.id == charity_project.id,
+            CharityProject.version == charity_project.version,
+            CharityProject.close_date.is_(None),
+        ]
+        if 'name' in values:
+            values['normalized_name'] = normalize_project_name(values['name'])
+        if 'full_amount' in values:
+            criteria.append(
+                CharityProject.invested_amount <= values['full_amount']
+            )
+            if values['full_amount'] == charity_project.invested_amount:
+                values['fully_invested'] = True
+                values['close_date'] = dt.now()
+        values['version'] = charity_project.version + 1
+        updated = await session.execute(
+            update(CharityProject).where(*criteria).values(
+                **values
+            ).execution_options(synchronize_session=False)
+        )
+        if updated.rowcount != 1:
+            return None
+        for field, value in values.items():
+            set_committed_value(charity_project, field, value)
+        return values
+
 
 charity_project_crud = CRUDCharityProject(CharityProject)
@@ -0,0 +1,36 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DataVersion
+
+DATA_VERSION_ID = 1
+
+
+class CRUDDataVersion:
+    """Класс для чтения и увеличения версии данных."""
+    @staticmethod
+    async def get_version(session: AsyncSession) -> int:
+        """Текущая версия данных, 0 — если данные ещё не менялись."""
+        version = await session.scalar(
+            select(DataVersion.version).where(
+                DataVersion.id == DATA_VERSION_ID
+            )
+        )
+        return version or 0
+
+    @staticmethod
+    def bump(connection: Connection) -> None:
+        """Увеличение версии данных в текущей транзакции."""
+        bumped = connection.execute(
+            update(DataVersion).where(
+                DataVersion.id == DATA_VERSION_ID
+            ).values(version=DataVersion.version + 1)
+        )
+        if not bumped.rowcount:
+            connection.execute(
+                insert(DataVersion).values(id=DATA_VERSION_ID, version=1)
+            )
+
+
+data_version_crud = CRUDDataVersion()
@@ -1,4 +1,7 @@
-from sqlalchemy import select
+from datetime import datetime as dt
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import Column
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import CRUDBase
@@ -7,16 +10,54 @@ from app.models import Donation, User
 
 class CRUDDonation(CRUDBase):
     @staticmethod
+    def get_user_criteria(
+            user: User,
+            created_from: Optional[dt] = None,
+            created_to: Optional[dt] = None,
+    ) -> list:
+        """
+        Условия отбора пожертвований пользователя за период.
+        Выборка идёт по индексу (user_id, create_date, id).
+        """
+        criteria = [Donation.user_id == user.id]
+        if created_from is not None:
+            criteria.append(Donation.create_date >= created_from)
+        if created_to is not None:
+            criteria.append(Donation.create_date < created_to)
+        return criteria
+
     async def get_by_user(
+            self,
             user: User,
             session: AsyncSession,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[dt, int]] = None,
+            columns: Optional[List[Column]] = None,
+            created_from: Optional[dt] = None,
+            created_to: Optional[dt] = None,
     ):
-        donations = await session.execute(
-            select(Donation).where(
-                Donation.user_id == user.id
-            )
+        return await self.get_page(
+            session, limit, after,
+            *self.get_user_criteria(user, created_from, created_to),
+            columns=columns,
+        )
+
+    def stream_by_user(
+            self,
+            user: User,
+            session: AsyncSession,
+            yield_per: int,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[dt, int]] = None,
+            columns: Optional[List[Column]] = None,
+            created_from: Optional[dt] = None,
+            created_to: Optional[dt] = None,
+    ) -> AsyncIterator:
+        return self.stream_page(
+            session, yield_per, limit, after,
+            *self.get_user_criteria(user, created_from, created_to),
+            columns=columns,
         )
-        return donations.scalars().all()
 
 
 donation_crud = CRUDDonation(Donation)
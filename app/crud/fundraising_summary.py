@@ -0,0 +1,104 @@
+from typing import Mapping, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import add_to_counters
+from app.models import CharityProject, Donation, FundraisingSummary
+
+FUNDRAISING_SUMMARY_ID = 1
+
+
+def get_totals_query():
+    """Итоги сбора средств, посчитанные по всем строкам."""
+    def total(column):
+        return select(func.coalesce(func.sum(column), 0)).scalar_subquery()
+
+    open_projects = CharityProject.fully_invested.is_not(True)
+    return select(
+        total(Donation.full_amount).label('total_raised'),
+        total(CharityProject.full_amount).label('total_pledged'),
+        select(func.count()).where(
+            open_projects
+        ).scalar_subquery().label('open_project_count'),
+        total(
+            CharityProject.full_amount - CharityProject.invested_amount
+        ).label('remaining_capacity'),
+        total(
+            Donation.full_amount - Donation.invested_amount
+        ).label('unallocated_balance'),
+    )
+
+
+class CRUDFundraisingSummary:
+    """Класс для чтения и обновления итогов сбора средств."""
+    @staticmethod
+    async def get(session: AsyncSession) -> FundraisingSummary:
+        """Итоги сбора средств, нули — если данных ещё нет."""
+        summary = await session.get(FundraisingSummary, FUNDRAISING_SUMMARY_ID)
+        if summary is None:
+            return FundraisingSummary(
+                id=FUNDRAISING_SUMMARY_ID,
+                total_raised=0,
+                total_pledged=0,
+                open_project_count=0,
+                remaining_capacity=0,
+                unallocated_balance=0,
+            )
+        return summary
+
+    @staticmethod
+    async def get_counters(
+            session: AsyncSession,
+            fields: Sequence[str],
+    ) -> Tuple[int, ...]:
+        """
+        Значения счётчиков итогов одним чтением строки по ключу,
+        в обход загруженных в сессию объектов; нули — если строки нет.
+        """
+        counters = await session.execute(
+            select(
+                *(getattr(FundraisingSummary, field) for field in fields)
+            ).where(
+                FundraisingSummary.id == FUNDRAISING_SUMMARY_ID
+            )
+        )
+        return tuple(counters.first() or (0,) * len(fields))
+
+    @staticmethod
+    def apply(connection: Connection, deltas: Mapping[str, int]) -> None:
+        """Прибавление приращений к итогам в текущей транзакции."""
+        add_to_counters(
+            connection,
+            FundraisingSummary.__table__,
+            ['id'],
+            {'id': FUNDRAISING_SUMMARY_ID, **deltas},
+        )
+
+    @staticmethod
+    def recalculate(connection: Connection) -> None:
+        """Пересчёт итогов по всем строкам в текущей транзакции."""
+        table = FundraisingSummary.__table__
+        totals = connection.execute(get_totals_query()).one()._asdict()
+        recalculated = connection.execute(
+            update(table).where(
+                table.c.id == FUNDRAISING_SUMMARY_ID
+            ).values(**totals)
+        )
+        if not recalculated.rowcount:
+            connection.execute(
+                insert(table).values(id=FUNDRAISING_SUMMARY_ID, **totals)
+            )
+
+    async def add(
+            self,
+            session: AsyncSession,
+            deltas: Mapping[str, int],
+    ) -> None:
+        """Приращение итогов из асинхронной сессии."""
+        connection = await session.connection()
+        await connection.run_sync(self.apply, deltas)
+
+
+fundraising_summary_crud = CRUDFundraisingSummary()
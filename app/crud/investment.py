@@ -0,0 +1,53 @@
+from datetime import datetime as dt
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import CRUDBase
+from app.models import Investment
+
+
+class CRUDInvestment(CRUDBase):
+    """Класс для CRUD-операций с переводами средств."""
+    @staticmethod
+    async def create_multi_values(
+            values: List[Dict[str, int]],
+            session: AsyncSession,
+    ) -> None:
+        """Вставка переводов одним executemany без фиксации транзакции."""
+        if values:
+            await session.execute(insert(Investment), values)
+
+    async def get_by_project(
+            self,
+            project_id: int,
+            session: AsyncSession,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[dt, int]] = None,
+            columns: Optional[List[Column]] = None,
+    ):
+        """Получение переводов в проект в порядке (create_date, id)."""
+        return await self.get_page(
+            session, limit, after,
+            Investment.project_id == project_id,
+            columns=columns,
+        )
+
+    async def get_by_donation(
+            self,
+            donation_id: int,
+            session: AsyncSession,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[dt, int]] = None,
+            columns: Optional[List[Column]] = None,
+    ):
+        """Получение переводов из пожертвования в порядке (create_date, id)."""
+        return await self.get_page(
+            session, limit, after,
+            Investment.donation_id == donation_id,
+            columns=columns,
+        )
+
+
+investment_crud = CRUDInvestment(Investment)
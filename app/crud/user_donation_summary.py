@@ -0,0 +1,107 @@
+from typing import Mapping
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import add_to_counters
+from app.models import Donation, Investment, User, UserDonationSummary
+
+
+class CRUDUserDonationSummary:
+    """Класс для чтения и обновления счётчиков пожертвований пользователей."""
+    @staticmethod
+    async def get_by_user(
+            user: User,
+            session: AsyncSession,
+    ) -> UserDonationSummary:
+        """Счётчики пользователя, нули — если пожертвований ещё нет."""
+        summary = await session.scalar(
+            select(UserDonationSummary).where(
+                UserDonationSummary.user_id == user.id
+            )
+        )
+        if summary is None:
+            return UserDonationSummary(
+                user_id=user.id,
+                donation_count=0,
+                total_donated=0,
+                total_allocated=0,
+            )
+        return summary
+
+    @staticmethod
+    def apply(
+            connection: Connection,
+            user_id: int,
+            deltas: Mapping[str, int],
+    ) -> None:
+        """Прибавление приращений к счётчикам пользователя."""
+        add_to_counters(
+            connection,
+            UserDonationSummary.__table__,
+            ['user_id'],
+            {'user_id': user_id, **deltas},
+        )
+
+    @staticmethod
+    def recalculate(connection: Connection, user_id: int) -> None:
+        """Пересчёт счётчиков пользователя по его пожертвованиям."""
+        table = UserDonationSummary.__table__
+        totals = connection.execute(
+            select(
+                func.count().label('donation_count'),
+                func.coalesce(
+                    func.sum(Donation.full_amount), 0
+                ).label('total_donated'),
+                func.coalesce(
+                    func.sum(Donation.invested_amount), 0
+                ).label('total_allocated'),
+            ).where(
+                Donation.user_id == user_id
+            )
+        ).one()._asdict()
+        recalculated = connection.execute(
+            update(table).where(table.c.user_id == user_id).values(**totals)
+        )
+        if not recalculated.rowcount:
+            connection.execute(insert(table).values(user_id=user_id, **totals))
+
+    @staticmethod
+    def apply_project_allocation(
+            connection: Connection,
+            project_id: int,
+    ) -> None:
+        """
+        Учёт переводов в проект из пожертвований, обновлённых запросами
+        в обход ORM: распределённая сумма каждого пользователя растёт
+        на сумму переводов из его пожертвований.
+        """
+        add_to_counters(
+            connection,
+            UserDonationSummary.__table__,
+            ['user_id'],
+            select(
+                Donation.user_id,
+                func.sum(Investment.amount).label('total_allocated'),
+            ).join(
+                Investment, Investment.donation_id == Donation.id
+            ).where(
+                Investment.project_id == project_id,
+                Donation.user_id.is_not(None),
+            ).group_by(
+                Donation.user_id
+            ),
+        )
+
+    async def add_project_allocation(
+            self,
+            session: AsyncSession,
+            project_id: int,
+    ) -> None:
+        """Учёт переводов в проект из асинхронной сессии."""
+        connection = await session.connection()
+        await connection.run_sync(self.apply_project_allocation, project_id)
+
+
+user_donation_summary_crud = CRUDUserDonationSummary()
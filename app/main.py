@@ -1,8 +1,20 @@
-from fastapi import FastAPI
+from http import HTTPStatus
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.exc import StaleDataError
 import uvicorn
 
 from app.api.routers import main_router
 from app.core import create_first_superuser, settings
+from app.services import (
+    allocation_worker, invalidation_bus, project_cache, warm_ledgers
+)
+from app.services.write_retry import is_lock_contention
+
+STALE_DATA_ERROR_MESSAGE = 'Данные изменились, повторите запрос!'
+DATABASE_BUSY_ERROR_MESSAGE = 'База данных занята, повторите запрос!'
 
 app = FastAPI(
     title=settings.app_title,
@@ -12,9 +24,48 @@ app = FastAPI(
 app.include_router(main_router)
 
 
+@app.exception_handler(StaleDataError)
+async def stale_data_exception_handler(request: Request, exc: StaleDataError):
+    """
+    Строку успела изменить другая транзакция: кеш проектов мог
+    устареть, поэтому сбрасывается, а клиент получает 409.
+    """
+    project_cache.invalidate()
+    return JSONResponse(
+        status_code=HTTPStatus.CONFLICT,
+        content={'detail': STALE_DATA_ERROR_MESSAGE},
+    )
+
+
+@app.exception_handler(OperationalError)
+async def operational_error_handler(request: Request, exc: OperationalError):
+    """
+    БД осталась занятой другими писателями дольше, чем позволяют
+    повторы транзакции: клиент получает 503 и может повторить запрос.
+    Остальные ошибки БД обрабатываются как прежде.
+    """
+    if not is_lock_contention(exc):
+        raise exc
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={'detail': DATABASE_BUSY_ERROR_MESSAGE},
+        headers={'Retry-After': '1'},
+    )
+
+
 @app.on_event('startup')
 async def startup():
     await create_first_superuser()
+    await warm_ledgers()
+    await invalidation_bus.start()
+    if settings.allocation_worker:
+        await allocation_worker.start()
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    await allocation_worker.stop()
+    await invalidation_bus.stop()
 
 
 if __name__ == '__main__':
@@ -1,5 +1,9 @@
 """Для доступа ко всем моделям в проекте."""
 from .base import InvestingBaseModel # noqa
 from .charity_project import CharityProject # noqa
+from .data_version import DataVersion # noqa
 from .donation import Donation # noqa
+from .fundraising_summary import FundraisingSummary # noqa
+from .investment import Investment # noqa
 from .user import User # noqa
+from .user_donation_summary import UserDonationSummary # noqa
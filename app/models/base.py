@@ -1,6 +1,9 @@
 from datetime import datetime as dt
 
-from sqlalchemy import Column, Integer, Boolean, DateTime, CheckConstraint
+from sqlalchemy import (
+    Column, Integer, Boolean, DateTime, CheckConstraint, Index, text
+)
+from sqlalchemy.orm import declared_attr
 
 from app.constants import DEFAULT_INVESTED_AMOUNT
 from app.core import Base
@@ -9,11 +12,36 @@ from app.core import Base
 class InvestingBaseModel(Base):
     """Базовый абстрактный класс для проектов и пожертвований."""
     __abstract__ = True
-    __table_args__ = (
-        CheckConstraint('full_amount > 0'),
-        CheckConstraint('invested_amount >= 0'),
-        CheckConstraint('invested_amount <= full_amount'),
-    )
+
+    @declared_attr
+    def __table_args__(cls):
+        """
+        Ограничения сумм, индекс очереди незакрытых объектов
+        и индекс постраничной выдачи в порядке создания.
+        Где БД позволяет, индекс очереди частичный и покрывает
+        выборку остатков.
+        """
+        return (
+            CheckConstraint('full_amount > 0'),
+            CheckConstraint('invested_amount >= 0'),
+            CheckConstraint('invested_amount <= full_amount'),
+            Index(
+                f'ix_{cls.__tablename__}_open_queue',
+                'fully_invested',
+                'create_date',
+                'id',
+                'full_amount',
+                'invested_amount',
+                sqlite_where=text('fully_invested IS 0'),
+                postgresql_where=text('fully_invested IS false'),
+            ),
+            Index(
+                f'ix_{cls.__tablename__}_create_date_id',
+                'create_date',
+                'id',
+            ),
+        )
+
     full_amount = Column(Integer, nullable=False)
     invested_amount = Column(
         Integer,
@@ -27,6 +55,12 @@ class InvestingBaseModel(Base):
         default=dt.now
     )
     close_date = Column(DateTime)
+    version = Column(Integer, nullable=False, server_default='1')
+
+    @declared_attr
+    def __mapper_args__(cls):
+        """Номер версии строки для оптимистичной блокировки."""
+        return {'version_id_col': cls.version}
 
     def __repr__(self):
         return (
@@ -1,16 +1,31 @@
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, String, Text, event
 
 from app.constants import MAX_LENGTH_PROJECT_NAME
 from app.models import InvestingBaseModel
 
 
+def normalize_project_name(name: str) -> str:
+    """Название без учёта регистра и лишних пробелов."""
+    return ' '.join(name.casefold().split())
+
+
 class CharityProject(InvestingBaseModel):
-    """Модель проектов для пожертвований."""
+    """
+    Модель проектов для пожертвований.
+    Уникальность названия без учёта регистра и пробелов обеспечивает
+    уникальный индекс нормализованного названия.
+    """
     name = Column(
         String(MAX_LENGTH_PROJECT_NAME),
         unique=True,
         nullable=False
     )
+    normalized_name = Column(
+        String(MAX_LENGTH_PROJECT_NAME),
+        index=True,
+        unique=True,
+        nullable=False
+    )
     description = Column(Text, nullable=False)
 
     def __repr__(self):
@@ -18,3 +33,10 @@ class CharityProject(InvestingBaseModel):
             f'Название проекта: {self.name}. '
             f'{super().__repr__()}'
         )
+
+
+@event.listens_for(CharityProject, 'before_insert')
+@event.listens_for(CharityProject, 'before_update')
+def set_normalized_name(mapper, connection, target):
+    """Нормализованное название записывается вместе с названием."""
+    target.normalized_name = normalize_project_name(target.name)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer
+
+from app.core import Base
+
+
+class DataVersion(Base):
+    """
+    Номер версии данных проектов и пожертвований.
+    Единственная строка увеличивается каждой транзакцией, которая
+    создаёт, изменяет или удаляет проекты и пожертвования.
+    """
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'Версия данных {self.version}.'
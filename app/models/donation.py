@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey
+from sqlalchemy import Column, Integer, Index, Text, ForeignKey
 
 from app.models.base import InvestingBaseModel
 
@@ -13,3 +13,11 @@ class Donation(InvestingBaseModel):
             f'Пожертвование пользователя с id{self.user_id}. '
             f'{super().__repr__()} '
         )
+
+
+Index(
+    'ix_donation_user_id_create_date',
+    Donation.user_id,
+    Donation.create_date,
+    Donation.id,
+)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer
+
+from app.core import Base
+
+
+class FundraisingSummary(Base):
+    """
+    Итоги сбора средств одной строкой.
+    Строка обновляется приращениями в той же транзакции, которая
+    создаёт, изменяет или удаляет проекты и пожертвования.
+    """
+    total_raised = Column(Integer, nullable=False, default=0)
+    total_pledged = Column(Integer, nullable=False, default=0)
+    open_project_count = Column(Integer, nullable=False, default=0)
+    remaining_capacity = Column(Integer, nullable=False, default=0)
+    unallocated_balance = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f'Собрано {self.total_raised} условных единиц. '
+            f'Требуется {self.total_pledged} условных единиц. '
+            f'Открытых проектов: {self.open_project_count}.'
+        )
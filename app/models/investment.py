@@ -0,0 +1,41 @@
+from datetime import datetime as dt
+
+from sqlalchemy import (
+    CheckConstraint, Column, DateTime, ForeignKey, Index, Integer
+)
+
+from app.core import Base
+
+
+class Investment(Base):
+    """Модель переводов средств из пожертвований в проекты."""
+    __table_args__ = (
+        CheckConstraint('amount > 0'),
+        Index(
+            'ix_investment_project_id_create_date',
+            'project_id',
+            'create_date',
+            'id'
+        ),
+        Index(
+            'ix_investment_donation_id_create_date',
+            'donation_id',
+            'create_date',
+            'id'
+        ),
+    )
+    donation_id = Column(Integer, ForeignKey('donation.id'), nullable=False)
+    project_id = Column(
+        Integer,
+        ForeignKey('charityproject.id'),
+        nullable=False
+    )
+    amount = Column(Integer, nullable=False)
+    create_date = Column(DateTime, nullable=False, default=dt.now)
+
+    def __repr__(self):
+        return (
+            f'Перевод {self.amount} условных единиц '
+            f'из пожертвования №{self.donation_id} '
+            f'в проект №{self.project_id}.'
+        )
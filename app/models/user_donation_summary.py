@@ -0,0 +1,25 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from app.core import Base
+
+
+class UserDonationSummary(Base):
+    """
+    Счётчики пожертвований пользователя.
+    Строка обновляется приращениями в той же транзакции, которая
+    создаёт пожертвования пользователя и распределяет их средства.
+    """
+    user_id = Column(
+        Integer, ForeignKey('user.id'), unique=True, nullable=False
+    )
+    donation_count = Column(Integer, nullable=False, default=0)
+    total_donated = Column(Integer, nullable=False, default=0)
+    total_allocated = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f'Пожертвований пользователя с id{self.user_id}: '
+            f'{self.donation_count}. '
+            f'Пожертвовано {self.total_donated} условных единиц. '
+            f'Распределено {self.total_allocated} условных единиц.'
+        )
@@ -1,4 +1,6 @@
 """Для доступа ко всем pydantic-схемам в проекте."""
 from .charity_project import CharityProjectCreate, CharityProjectUpdate, CharityProjectDB # noqa
-from .donation import DonationCreate, DonationDB # noqa
+from .donation import DonationCreate, DonationDB, UserDonationSummaryDB # noqa
+from .fundraising_summary import FundraisingSummaryDB # noqa
+from .investment import InvestmentDB # noqa
 from .user import UserCreate, UserRead, UserUpdate # noqa
@@ -29,3 +29,13 @@ class DonationDB(DonationCreate):
 
     class Config:
         orm_mode = True
+
+
+class UserDonationSummaryDB(BaseModel):
+    """Схема счётчиков пожертвований пользователя."""
+    donation_count: int
+    total_donated: int
+    total_allocated: int
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class FundraisingSummaryDB(BaseModel):
+    """Схема итогов сбора средств."""
+    total_raised: int
+    total_pledged: int
+    open_project_count: int
+    remaining_capacity: int
+    unallocated_balance: int
+
+    class Config:
+        orm_mode = True
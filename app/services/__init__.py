@@ -1,2 +1,11 @@
 """Для доступа ко всем функциям сервисов в проекте."""
-from .investing import investing_process # noqa
+from .investing import create_and_invest, invest_many, investing_process # noqa
+from .ledger import charity_project_ledger, donation_ledger, warm_ledgers # noqa
+from .allocation_worker import allocation_worker # noqa
+from .charity_project import update_charity_project # noqa
+from .data_version import bump_data_version # noqa
+from .fundraising_summary import update_fundraising_summary # noqa
+from .invalidation import invalidation_bus # noqa
+from .project_cache import get_cached_project, project_cache # noqa
+from .user_donation_summary import update_user_donation_summaries # noqa
+from .write_retry import write_retry # noqa
@@ -0,0 +1,138 @@
+import asyncio
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.core import settings
+from app.core.db import AsyncSessionLocal
+from app.crud import CRUDBase
+from app.models import User
+from app.services.investing import invest_many
+from app.services.write_retry import write_retry
+
+
+@dataclass
+class AllocationJob:
+    """Заявка на создание объекта с распределением средств."""
+    crud: CRUDBase
+    obj_in: BaseModel
+    schema: type
+    user: Optional[User] = None
+    future: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class AllocationWorker:
+    """
+    Единственный исполнитель распределения средств в процессе.
+    Эндпоинты ставят заявки в очередь и ждут результат, а исполнитель
+    забирает всё накопившееся и применяет пачку одной транзакцией.
+    Если транзакция пачки не удалась, заявки повторяются по одной,
+    чтобы ошибка одной заявки не отменяла остальные.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Запуск исполнителя в текущем цикле событий."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Обработка оставшихся заявок и остановка исполнителя."""
+        if not self.is_running:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(
+            self,
+            crud: CRUDBase,
+            obj_in: BaseModel,
+            schema: type,
+            user: Optional[User] = None,
+    ):
+        """Постановка заявки в очередь и ожидание созданного объекта."""
+        job = AllocationJob(crud=crud, obj_in=obj_in, schema=schema, user=user)
+        await self._queue.put(job)
+        return await job.future
+
+    async def _run(self) -> None:
+        while True:
+            jobs = [await self._queue.get()]
+            while (
+                len(jobs) < settings.allocation_batch_size and
+                not self._queue.empty()
+            ):
+                jobs.append(self._queue.get_nowait())
+            try:
+                await self._process(jobs)
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+
+    async def _process(self, jobs: List[AllocationJob]) -> None:
+        try:
+            results = await self._apply(jobs)
+        except Exception as error:
+            if len(jobs) == 1:
+                if not jobs[0].future.done():
+                    jobs[0].future.set_exception(error)
+                return
+            for job in jobs:
+                await self._process([job])
+            return
+        for job, result in zip(jobs, results):
+            if not job.future.done():
+                job.future.set_result(result)
+
+    async def _apply(self, jobs: List[AllocationJob]) -> list:
+        async with self.session_factory() as session:
+            results = await write_retry.run(
+                lambda: self._create(jobs, session), session
+            )
+        self.batches += 1
+        return results
+
+    @staticmethod
+    async def _create(jobs: List[AllocationJob], session) -> list:
+        created = []
+        for _, group in groupby(jobs, key=lambda job: job.crud):
+            group_objs = [
+                await job.crud.create(
+                    obj_in=job.obj_in,
+                    session=session,
+                    user=job.user,
+                    commit=False,
+                )
+                for job in group
+            ]
+            await invest_many(targets=group_objs, session=session)
+            created.extend(group_objs)
+        await session.flush()
+        results = [
+            job.schema.from_orm(obj) for job, obj in zip(jobs, created)
+        ]
+        await session.commit()
+        return results
+
+
+allocation_worker = AllocationWorker()
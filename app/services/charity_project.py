@@ -0,0 +1,46 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import charity_project_crud
+from app.models import CharityProject
+from app.schemas import CharityProjectUpdate
+from app.services.data_version import bump_data_version_once
+from app.services.fundraising_summary import (
+    get_current_values, record_set_based_update
+)
+from app.services.ledger import record_capacity_change
+from app.services.project_cache import mark_project_changed
+
+
+async def update_charity_project(
+        charity_project: CharityProject,
+        obj_in: CharityProjectUpdate,
+        session: AsyncSession,
+) -> Optional[CharityProject]:
+    """
+    Изменение проекта условным UPDATE и фиксация транзакции.
+    Запись идёт в обход ORM, поэтому версия данных, итоги сбора,
+    реестр остатков и кеш проектов обновляются здесь же.
+    Возвращает изменённый проект или None, если проект закрыт,
+    новая сумма меньше вложенной или строку успели изменить.
+    """
+    committed = get_current_values(charity_project)
+    values = await charity_project_crud.update_open(
+        charity_project=charity_project,
+        obj_in=obj_in,
+        session=session,
+    )
+    if values is None:
+        return None
+    await session.run_sync(bump_data_version_once)
+    await record_set_based_update(
+        session,
+        CharityProject,
+        committed,
+        get_current_values(charity_project),
+    )
+    record_capacity_change(session, charity_project)
+    mark_project_changed(session, charity_project.id)
+    await session.commit()
+    return charity_project
@@ -0,0 +1,38 @@
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import data_version_crud
+from app.models import InvestingBaseModel, User
+
+DATA_VERSION_BUMPED_KEY = 'data_version_bumped'
+
+
+def bump_data_version_once(session: Session) -> None:
+    """Увеличение версии данных один раз за транзакцию."""
+    if session.info.get(DATA_VERSION_BUMPED_KEY):
+        return
+    data_version_crud.bump(session.connection())
+    session.info[DATA_VERSION_BUMPED_KEY] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def bump_data_version(session, flush_context):
+    """
+    Увеличение версии данных, если транзакция записала проекты,
+    пожертвования или пользователей. Распределение средств всегда
+    записывает цель, поэтому тоже меняет версию. По версии другие
+    процессы сбрасывают и кеш пользователей.
+    """
+    if any(
+        isinstance(obj, (InvestingBaseModel, User))
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ):
+        bump_data_version_once(session)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def reset_data_version_bump(session):
+    session.info.pop(DATA_VERSION_BUMPED_KEY, None)
@@ -0,0 +1,128 @@
+from collections import Counter
+from typing import Iterator, Optional, Tuple, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.crud import fundraising_summary_crud
+from app.models import CharityProject, InvestingBaseModel
+
+SUMMARY_FIELDS = ('full_amount', 'invested_amount', 'fully_invested')
+UNKNOWN_VALUES = object()
+
+
+def get_contribution(
+        model: Type[InvestingBaseModel],
+        full_amount: int,
+        invested_amount: int,
+        fully_invested: Optional[bool],
+) -> Counter:
+    """Вклад одного объекта в итоги сбора средств."""
+    if model is CharityProject:
+        return Counter(
+            total_pledged=full_amount,
+            remaining_capacity=full_amount - invested_amount,
+            open_project_count=int(not fully_invested),
+        )
+    return Counter(
+        total_raised=full_amount,
+        unallocated_balance=full_amount - invested_amount,
+    )
+
+
+def get_committed_values(obj: InvestingBaseModel):
+    """
+    Значения полей объекта до изменения в текущем сбросе.
+    UNKNOWN_VALUES — если прежнее значение не было загружено.
+    """
+    state = inspect(obj)
+    values = []
+    for field in SUMMARY_FIELDS:
+        history = state.attrs[field].history
+        committed = history.deleted or history.unchanged
+        if not committed:
+            return UNKNOWN_VALUES
+        values.append(committed[0])
+    return tuple(values)
+
+
+def get_current_values(obj: InvestingBaseModel) -> Tuple:
+    return obj.full_amount, obj.invested_amount or 0, obj.fully_invested
+
+
+def get_flushed_changes(
+        session: Session,
+        model: Type[InvestingBaseModel],
+) -> Iterator[Tuple[InvestingBaseModel, Optional[Tuple], Optional[Tuple]]]:
+    """
+    Записанные в сбросе объекты модели с прежними и новыми значениями
+    полей сумм. У созданных объектов нет прежних значений,
+    у удалённых — новых.
+    """
+    for obj in session.new:
+        if isinstance(obj, model):
+            yield obj, None, get_current_values(obj)
+    for obj in session.dirty:
+        if isinstance(obj, model):
+            yield obj, get_committed_values(obj), get_current_values(obj)
+    for obj in session.deleted:
+        if isinstance(obj, model):
+            yield obj, get_committed_values(obj), None
+
+
+@event.listens_for(Session, 'after_flush')
+def update_fundraising_summary(session, flush_context):
+    """
+    Приращение итогов сбора средств по записанным проектам
+    и пожертвованиям в той же транзакции. Если прежние значения
+    изменённого объекта неизвестны, итоги пересчитываются целиком.
+    """
+    deltas = Counter()
+    for obj, committed, current in get_flushed_changes(
+        session, InvestingBaseModel
+    ):
+        if committed is UNKNOWN_VALUES:
+            fundraising_summary_crud.recalculate(session.connection())
+            return
+        if committed is not None:
+            deltas.subtract(get_contribution(type(obj), *committed))
+        if current is not None:
+            deltas.update(get_contribution(type(obj), *current))
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        fundraising_summary_crud.apply(session.connection(), deltas)
+
+
+async def record_set_based_allocation(
+        session: AsyncSession,
+        source_model: Type[InvestingBaseModel],
+        invested: int,
+        closed_count: int,
+) -> None:
+    """
+    Учёт в итогах источников, обновлённых запросами в обход ORM:
+    их остаток уменьшился на вложенную сумму, closed_count закрылись.
+    """
+    if source_model is CharityProject:
+        deltas = {
+            'remaining_capacity': -invested,
+            'open_project_count': -closed_count,
+        }
+    else:
+        deltas = {'unallocated_balance': -invested}
+    await fundraising_summary_crud.add(session, deltas)
+
+
+async def record_set_based_update(
+        session: AsyncSession,
+        model: Type[InvestingBaseModel],
+        committed: Tuple,
+        current: Tuple,
+) -> None:
+    """Учёт в итогах объекта, обновлённого запросом в обход ORM."""
+    deltas = get_contribution(model, *current)
+    deltas.subtract(get_contribution(model, *committed))
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        await fundraising_summary_crud.add(session, deltas)
@@ -0,0 +1,194 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Callable, Dict, Hashable, List, Optional, Type
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core import settings
+from app.core.db import AsyncSessionLocal, engine
+from app.core.user_cache import user_cache
+from app.crud import data_version_crud
+
+
+class InvalidationTransport(ABC):
+    """
+    Канал сигналов об изменении данных другими процессами.
+    Реализация ждёт в wait следующего изменения и возвращает управление,
+    когда кеши процесса нужно сбросить.
+    """
+
+    async def open(self) -> None:
+        pass
+
+    @abstractmethod
+    async def wait(self) -> None:
+        """Ожидание следующего изменения данных."""
+
+    async def close(self) -> None:
+        pass
+
+
+class PollingTransport(InvalidationTransport):
+    """
+    Опрос метки состояния БД с заданным интервалом.
+    Изменение метки с прошлого опроса — сигнал к сбросу кешей.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._token: Optional[Hashable] = None
+
+    @abstractmethod
+    async def read_token(self) -> Hashable:
+        """Текущая метка состояния БД."""
+
+    async def open(self) -> None:
+        self._token = await self.read_token()
+
+    async def wait(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            token = await self.read_token()
+            if token != self._token:
+                self._token = token
+                return
+
+
+class DataVersionTransport(PollingTransport):
+    """Опрос строки версии данных, работает с любой БД."""
+
+    def __init__(self, interval: float, session_factory=AsyncSessionLocal):
+        super().__init__(interval)
+        self.session_factory = session_factory
+
+    async def read_token(self) -> int:
+        async with self.session_factory() as session:
+            return await data_version_crud.get_version(session)
+
+
+class SQLiteDataVersionTransport(PollingTransport):
+    """
+    Опрос PRAGMA data_version на отдельном соединении SQLite:
+    значение меняется после каждой фиксации транзакции другим
+    соединением с тем же файлом БД.
+    """
+
+    def __init__(self, interval: float, engine: AsyncEngine = engine):
+        super().__init__(interval)
+        self.engine = engine
+        self.connection: Optional[AsyncConnection] = None
+
+    async def open(self) -> None:
+        self.connection = await self.engine.connect()
+        await super().open()
+
+    async def read_token(self) -> int:
+        data_version = await self.connection.scalar(
+            text('PRAGMA data_version')
+        )
+        await self.connection.rollback()
+        return data_version
+
+    async def close(self) -> None:
+        await self.connection.close()
+        self.connection = None
+
+
+INVALIDATION_TRANSPORTS: Dict[str, Type[PollingTransport]] = {
+    'version': DataVersionTransport,
+    'sqlite': SQLiteDataVersionTransport,
+}
+
+
+def get_transport_name() -> Optional[str]:
+    """Канал из настроек, auto выбирает канал по драйверу БД."""
+    name = settings.cache_invalidation_transport
+    if name == 'none':
+        return None
+    if name == 'auto':
+        return 'sqlite' if engine.dialect.name == 'sqlite' else 'version'
+    return name
+
+
+class InvalidationBus:
+    """
+    Шина сброса кешей между процессами. Каждый процесс слушает канал
+    в фоновой задаче и вызывает подписчиков, когда данные изменил
+    кто-то другой, поэтому кеши процессов сходятся не позже чем через
+    интервал опроса без проверок БД в запросах. Если канал недоступен,
+    подписчики тоже вызываются: лишний сброс безопаснее устаревшего кеша.
+    """
+
+    def __init__(self):
+        self.subscribers: List[Callable[[], None]] = []
+        self.stats = Counter()
+        self.transport: Optional[InvalidationTransport] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Регистрация сброса кеша процесса."""
+        self.subscribers.append(callback)
+
+    def notify(self) -> None:
+        self.stats['notifications'] += 1
+        for callback in self.subscribers:
+            callback()
+
+    async def start(
+            self,
+            transport: Optional[InvalidationTransport] = None,
+    ) -> None:
+        """
+        Подключение к каналу и запуск фоновой задачи. Без явного канала
+        берётся канал из настроек.
+        """
+        if self.is_running:
+            return
+        if transport is None:
+            name = get_transport_name()
+            if name is None:
+                return
+            transport = INVALIDATION_TRANSPORTS[name](
+                interval=settings.cache_invalidation_interval
+            )
+        await transport.open()
+        self.transport = transport
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановка фоновой задачи и отключение от канала."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.transport.close()
+        self.transport = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.transport.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.stats['errors'] += 1
+                self.notify()
+                await asyncio.sleep(settings.cache_invalidation_interval)
+                continue
+            self.notify()
+
+
+invalidation_bus = InvalidationBus()
+# Кеш пользователей находится в app.core и шину не импортирует,
+# поэтому подписывается здесь.
+invalidation_bus.subscribe(user_cache.invalidate)
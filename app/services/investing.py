@@ -1,7 +1,60 @@
+from contextlib import aclosing
 from datetime import datetime as dt
 
-from typing import List
-from app.models import InvestingBaseModel
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import settings
+from app.crud import (
+    CRUDBase, charity_project_crud, donation_crud, investment_crud
+)
+from app.models import CharityProject, Donation, InvestingBaseModel, User
+from app.services.data_version import bump_data_version_once
+from app.services.ledger import LEDGERS
+from app.services.project_cache import mark_all_projects_changed
+from app.services.sql_investing import sql_investing_process
+from app.services.write_retry import write_retry
+
+SOURCE_CRUDS = {
+    CharityProject: donation_crud,
+    Donation: charity_project_crud,
+}
+
+
+class Transfer(NamedTuple):
+    """Перевод средств между целью и источником."""
+    target: InvestingBaseModel
+    source: InvestingBaseModel
+    amount: int
+
+    def as_investment(self) -> Dict[str, int]:
+        """Значения строки перевода для таблицы investment."""
+        donation, project = self.target, self.source
+        if isinstance(self.target, CharityProject):
+            donation, project = project, donation
+        return dict(
+            donation_id=donation.id,
+            project_id=project.id,
+            amount=self.amount,
+        )
+
+
+def invest_pair(
+    target: InvestingBaseModel,
+    source: InvestingBaseModel
+) -> int:
+    """Перенос средств между двумя объектами, возвращает вложенную сумму."""
+    investing_amount = min(
+        target.full_amount - target.invested_amount,
+        source.full_amount - source.invested_amount
+    )
+    for invest in target, source:
+        invest.invested_amount += investing_amount
+        if invest.full_amount == invest.invested_amount:
+            invest.fully_invested = True
+            invest.close_date = dt.now()
+    return investing_amount
 
 
 def investing_process(
@@ -11,16 +64,121 @@ def investing_process(
     """Функция для реализации процесса «инвестирования»."""
     modified = []
     for source in sources:
-        investing_amount = min(
-            target.full_amount - target.invested_amount,
-            source.full_amount - source.invested_amount
-        )
-        if investing_amount == 0:
+        if invest_pair(target, source) == 0:
             break
-        for invest in target, source:
-            invest.invested_amount += investing_amount
-            if invest.full_amount == invest.invested_amount:
-                invest.fully_invested = True
-                invest.close_date = dt.now()
         modified.append(source)
     return modified
+
+
+async def bulk_investing_process(
+    targets: Iterable[InvestingBaseModel],
+    sources: AsyncIterator[InvestingBaseModel]
+) -> List[Transfer]:
+    """
+    Процесс «инвестирования» для нескольких целей за один проход
+    по асинхронному итератору источников: цели по очереди забирают
+    средства самых старых источников, как при последовательной обработке.
+    Следующий источник запрашивается, только пока текущая цель не закрыта.
+    """
+    transfers = []
+    source = None
+    for target in targets:
+        while target.full_amount > target.invested_amount:
+            if source is None or source.fully_invested:
+                try:
+                    source = await sources.__anext__()
+                except StopAsyncIteration:
+                    return transfers
+            transfers.append(
+                Transfer(target, source, invest_pair(target, source))
+            )
+    return transfers
+
+
+async def stream_investing_process(
+    target: InvestingBaseModel,
+    sources: AsyncIterator[InvestingBaseModel]
+) -> List[InvestingBaseModel]:
+    """Процесс «инвестирования» из асинхронного итератора источников."""
+    transfers = await bulk_investing_process([target], sources)
+    return [transfer.source for transfer in transfers]
+
+
+def get_remaining(target: InvestingBaseModel) -> int:
+    """Сумма, которой не хватает цели до закрытия."""
+    return target.full_amount - (target.invested_amount or 0)
+
+
+async def invest_many(
+    targets: List[InvestingBaseModel],
+    session: AsyncSession
+) -> None:
+    """
+    Распределение средств нескольких целей одного типа по открытым
+    объектам другого типа движком, выбранным в настройках.
+    Каждый перевод записывается в таблицу investment.
+    Ещё не записанные цели попадают в БД уже с итоговыми суммами:
+    пока источники читаются, сессия не синхронизируется.
+    """
+    if not targets:
+        return
+    if session.bind.dialect.name == 'sqlite':
+        # Первая запись транзакции берёт блокировку записи SQLite до чтения
+        # источников: одновременные распределения идут по очереди,
+        # а не читают одни и те же источники и не конфликтуют версиями.
+        # Версия данных меняется при любом распределении.
+        await session.run_sync(bump_data_version_once)
+    source_crud = SOURCE_CRUDS[type(targets[0])]
+    ledger = LEDGERS[source_crud.model]
+    if settings.investing_engine == 'sql':
+        for target in targets:
+            await sql_investing_process(target, source_crud.model, session)
+        ledger.invalidate()
+        if source_crud.model is CharityProject:
+            mark_all_projects_changed(session)
+        return
+    with session.no_autoflush:
+        if settings.investing_sources == 'stream':
+            sources = source_crud.stream_not_fully_invested(
+                session, settings.investing_yield_per
+            )
+        else:
+            sources = ledger.get_sources(
+                sum(map(get_remaining, targets)), session
+            )
+        async with aclosing(sources):
+            transfers = await bulk_investing_process(targets, sources)
+    session.add_all(transfer.source for transfer in transfers)
+    await session.flush()
+    await investment_crud.create_multi_values(
+        [transfer.as_investment() for transfer in transfers], session
+    )
+
+
+async def create_and_invest(
+    crud: CRUDBase,
+    objs_in: List[BaseModel],
+    schema: type,
+    session: AsyncSession,
+    user: Optional[User] = None,
+) -> list:
+    """
+    Создание объектов, распределение их средств и фиксация транзакции.
+    Если параллельная транзакция успела изменить источники (версия строки
+    не совпала) или заняла БД, транзакция откатывается и повторяется
+    с нуля со случайной паузой.
+    Возвращает созданные объекты в виде схем, собранных до фиксации.
+    """
+    async def create() -> list:
+        targets = await crud.create_multi(
+            objs_in=objs_in,
+            session=session,
+            user=user,
+        )
+        await invest_many(targets=targets, session=session)
+        await session.flush()
+        created = [schema.from_orm(target) for target in targets]
+        await session.commit()
+        return created
+
+    return await write_retry.run(create, session)
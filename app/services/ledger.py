@@ -0,0 +1,231 @@
+from bisect import bisect_left, insort
+from contextlib import aclosing
+from datetime import datetime as dt
+from itertools import chain
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import settings
+from app.core.db import AsyncSessionLocal
+from app.crud import (
+    CRUDBase, charity_project_crud, donation_crud, fundraising_summary_crud
+)
+from app.models import CharityProject, Donation, InvestingBaseModel
+
+LEDGER_CHANGES_KEY = 'open_capacity_ledger_changes'
+CAPACITY_FIELDS = (
+    'create_date', 'full_amount', 'invested_amount', 'fully_invested'
+)
+UNKNOWN_CAPACITY = object()
+# Счётчики строки итогов, с которыми сверяется реестр модели:
+# число незакрытых объектов (если итоги его хранят) и сумма остатков.
+SUMMARY_FINGERPRINTS = {
+    CharityProject: ('open_project_count', 'remaining_capacity'),
+    Donation: (None, 'unallocated_balance'),
+}
+
+
+class OpenCapacityLedger:
+    """
+    Реестр незакрытых объектов в памяти процесса.
+    Хранит остаток до закрытия каждого объекта в порядке даты создания,
+    чтобы при распределении загружать из БД только нужные строки.
+    """
+
+    def __init__(self, crud: CRUDBase):
+        self.crud = crud
+        self.is_warm = False
+        self._queue: List[Tuple[dt, int]] = []
+        self._entries: Dict[int, Tuple[dt, int]] = {}
+        self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def fingerprint(self) -> Tuple[int, int]:
+        """Количество объектов в реестре и сумма их остатков."""
+        return len(self._entries), self._total
+
+    def load(self, open_capacity: List[Tuple[int, dt, int]]) -> None:
+        """Полная замена содержимого реестра."""
+        self._entries = {
+            obj_id: (create_date, remaining)
+            for obj_id, create_date, remaining in open_capacity
+        }
+        self._queue = sorted(
+            (create_date, obj_id)
+            for obj_id, (create_date, _) in self._entries.items()
+        )
+        self._total = sum(
+            remaining for _, remaining in self._entries.values()
+        )
+        self.is_warm = True
+
+    async def warm(self, session: AsyncSession) -> None:
+        """Загрузка реестра из БД."""
+        self.load(await self.crud.get_open_capacity(session))
+
+    async def is_in_sync(self, session: AsyncSession) -> bool:
+        """
+        Сверка реестра с итогами сбора средств, которые обновляются
+        в каждой транзакции записи: читается одна строка по ключу,
+        а не все незакрытые объекты.
+        """
+        count_field, total_field = SUMMARY_FINGERPRINTS[self.crud.model]
+        if count_field is None:
+            [total] = await fundraising_summary_crud.get_counters(
+                session, [total_field]
+            )
+            return total == self._total
+        fingerprint = await fundraising_summary_crud.get_counters(
+            session, [count_field, total_field]
+        )
+        return fingerprint == self.fingerprint
+
+    def invalidate(self) -> None:
+        """Пометка реестра как устаревшего до следующей загрузки."""
+        self.is_warm = False
+
+    def discard(self, obj_id: int) -> None:
+        """Удаление объекта из реестра."""
+        entry = self._entries.pop(obj_id, None)
+        if entry is None:
+            return
+        create_date, remaining = entry
+        del self._queue[bisect_left(self._queue, (create_date, obj_id))]
+        self._total -= remaining
+
+    def put(self, obj_id: int, create_date: dt, remaining: int) -> None:
+        """Добавление или обновление объекта; закрытые объекты удаляются."""
+        self.discard(obj_id)
+        if remaining <= 0:
+            return
+        self._entries[obj_id] = (create_date, remaining)
+        insort(self._queue, (create_date, obj_id))
+        self._total += remaining
+
+    def remaining(self, obj_id: int) -> Optional[int]:
+        """Остаток до закрытия объекта по данным реестра."""
+        entry = self._entries.get(obj_id)
+        return None if entry is None else entry[1]
+
+    def head(self, amount: int) -> List[int]:
+        """id самых старых объектов, остатков которых хватает на сумму."""
+        obj_ids = []
+        for _, obj_id in self._queue:
+            if amount <= 0:
+                break
+            obj_ids.append(obj_id)
+            amount -= self._entries[obj_id][1]
+        return obj_ids
+
+    async def get_sources(
+            self,
+            amount: int,
+            session: AsyncSession,
+    ) -> AsyncIterator[InvestingBaseModel]:
+        """
+        Источники для инвестирования суммы в порядке даты создания.
+        Реестр сверяется с итогами сбора средств и перезагружается
+        при расхождении; загруженные источники сверяются с реестром.
+        Если они не совпали, источники читаются из БД потоком:
+        блокируются только строки, до которых дошло распределение.
+        """
+        if not self.is_warm or not await self.is_in_sync(session):
+            await self.warm(session)
+        obj_ids = self.head(amount)
+        if not obj_ids:
+            return
+        sources = await self.crud.get_by_ids(obj_ids, session)
+        if [source.id for source in sources] != obj_ids or any(
+            source.full_amount - source.invested_amount !=
+            self.remaining(source.id) for source in sources
+        ):
+            self.invalidate()
+            sources = self.crud.stream_not_fully_invested(
+                session, settings.investing_yield_per
+            )
+            async with aclosing(sources):
+                async for source in sources:
+                    yield source
+            return
+        for source in sources:
+            yield source
+
+
+charity_project_ledger = OpenCapacityLedger(charity_project_crud)
+donation_ledger = OpenCapacityLedger(donation_crud)
+LEDGERS = {
+    CharityProject: charity_project_ledger,
+    Donation: donation_ledger,
+}
+
+
+async def warm_ledgers() -> None:
+    """Загрузка всех реестров при старте приложения."""
+    async with AsyncSessionLocal() as session:
+        for ledger in LEDGERS.values():
+            await ledger.warm(session)
+
+
+def get_capacity(obj: InvestingBaseModel):
+    """Снимок даты создания и остатка объекта без обращения к БД."""
+    state = inspect(obj).dict
+    if any(field not in state for field in CAPACITY_FIELDS):
+        return UNKNOWN_CAPACITY
+    if state['fully_invested']:
+        return None
+    return (
+        state['create_date'],
+        state['full_amount'] - state['invested_amount']
+    )
+
+
+def record_capacity_change(
+        session: AsyncSession,
+        obj: InvestingBaseModel,
+) -> None:
+    """
+    Учёт в реестре объекта, обновлённого запросом в обход ORM:
+    после фиксации реестр получает его текущий остаток.
+    """
+    changes = session.sync_session.info.setdefault(LEDGER_CHANGES_KEY, {})
+    changes[type(obj), obj.id] = get_capacity(obj)
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_ledger_changes(session, flush_context):
+    """Сбор изменений объектов инвестирования до завершения транзакции."""
+    changes = session.info.setdefault(LEDGER_CHANGES_KEY, {})
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, InvestingBaseModel):
+            changes[type(obj), obj.id] = get_capacity(obj)
+    for obj in session.deleted:
+        if isinstance(obj, InvestingBaseModel):
+            changes[type(obj), obj.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def apply_ledger_changes(session):
+    """Применение зафиксированных изменений к реестрам."""
+    changes = session.info.pop(LEDGER_CHANGES_KEY, {})
+    for (model, obj_id), capacity in changes.items():
+        ledger = LEDGERS.get(model)
+        if ledger is None or not ledger.is_warm:
+            continue
+        if capacity is UNKNOWN_CAPACITY:
+            ledger.invalidate()
+        elif capacity is None:
+            ledger.discard(obj_id)
+        else:
+            ledger.put(obj_id, *capacity)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_ledger_changes(session):
+    """Отмена несохранённых изменений реестров."""
+    session.info.pop(LEDGER_CHANGES_KEY, None)
@@ -0,0 +1,146 @@
+from collections import Counter
+from typing import Any, Dict, Hashable, Optional, Set
+
+from cachetools import TTLCache
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core import settings
+from app.crud import charity_project_crud
+from app.models import CharityProject
+from app.services.invalidation import invalidation_bus
+
+PROJECT_CHANGES_KEY = 'project_cache_changes'
+ALL_PROJECTS = None
+
+
+class ProjectCache:
+    """
+    Кеш процесса для списка проектов и отдельных проектов.
+    Размер ограничен, устаревшие записи вытесняются по LRU и по TTL.
+    Записи сбрасываются после фиксации транзакций, изменивших проекты.
+    Каждый сброс увеличивает поколение кеша: значение, прочитанное
+    из БД до сброса, в кеш уже не попадает.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.lists = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.projects = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.stats = Counter()
+        self.generation = 0
+
+    def _get(self, name: str, cache: TTLCache, key: Hashable):
+        value = cache.get(key)
+        outcome = 'misses' if value is None else 'hits'
+        self.stats[f'{name}_{outcome}'] += 1
+        return value
+
+    def get_list(self, key: Hashable) -> Optional[Any]:
+        """Сохранённый ответ со списком проектов."""
+        return self._get('list', self.lists, key)
+
+    def put_list(self, key: Hashable, value: Any, generation: int) -> None:
+        if generation == self.generation:
+            self.lists[key] = value
+
+    def get_project(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """Снимок столбцов проекта."""
+        return self._get('project', self.projects, project_id)
+
+    def put_project(self, project: CharityProject, generation: int) -> None:
+        if generation != self.generation:
+            return
+        self.projects[project.id] = {
+            column.key: getattr(project, column.key)
+            for column in inspect(CharityProject).column_attrs
+        }
+
+    def invalidate(self, project_ids: Optional[Set[int]] = ALL_PROJECTS):
+        """
+        Сброс списков и снимков изменённых проектов.
+        Без списка id сбрасываются все снимки.
+        """
+        self.stats['invalidations'] += 1
+        self.generation += 1
+        self.lists.clear()
+        if project_ids is ALL_PROJECTS:
+            self.projects.clear()
+            return
+        for project_id in project_ids:
+            self.projects.pop(project_id, None)
+
+
+project_cache = ProjectCache(
+    maxsize=settings.project_cache_size,
+    ttl=settings.project_cache_ttl,
+)
+invalidation_bus.subscribe(project_cache.invalidate)
+
+
+async def get_cached_project(
+        project_id: int,
+        session: AsyncSession,
+) -> Optional[CharityProject]:
+    """
+    Проект по id из кеша или из БД. Проект из кеша подключается
+    к сессии без запроса. Если снимок устарел, запись проекта
+    отклоняется проверкой версии строки.
+    """
+    snapshot = project_cache.get_project(project_id)
+    if snapshot is None:
+        generation = project_cache.generation
+        charity_project = await charity_project_crud.get(project_id, session)
+        if charity_project is not None:
+            project_cache.put_project(charity_project, generation)
+        return charity_project
+    charity_project = CharityProject(**snapshot)
+    make_transient_to_detached(charity_project)
+    return await session.merge(charity_project, load=False)
+
+
+def mark_all_projects_changed(session: AsyncSession) -> None:
+    """
+    Пометка транзакции, изменившей проекты запросами в обход ORM:
+    после фиксации кеш сбрасывается целиком.
+    """
+    session.sync_session.info[PROJECT_CHANGES_KEY] = ALL_PROJECTS
+
+
+def mark_project_changed(session: AsyncSession, project_id: int) -> None:
+    """
+    Пометка проекта, изменённого запросом в обход ORM:
+    после фиксации его снимок и списки сбрасываются.
+    """
+    info = session.sync_session.info
+    changes = info.get(PROJECT_CHANGES_KEY, set())
+    if changes is ALL_PROJECTS:
+        return
+    changes.add(project_id)
+    info[PROJECT_CHANGES_KEY] = changes
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_project_changes(session, flush_context):
+    """Сбор id проектов, записанных в транзакции."""
+    changes = session.info.get(PROJECT_CHANGES_KEY, set())
+    if changes is ALL_PROJECTS:
+        return
+    for objs in session.new, session.dirty, session.deleted:
+        changes.update(
+            obj.id for obj in objs if isinstance(obj, CharityProject)
+        )
+    if changes:
+        session.info[PROJECT_CHANGES_KEY] = changes
+
+
+@event.listens_for(Session, 'after_commit')
+def apply_project_changes(session):
+    """Сброс кеша после фиксации изменений проектов."""
+    if PROJECT_CHANGES_KEY in session.info:
+        project_cache.invalidate(session.info.pop(PROJECT_CHANGES_KEY))
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_project_changes(session):
+    session.info.pop(PROJECT_CHANGES_KEY, None)
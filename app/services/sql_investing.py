@@ -0,0 +1,144 @@
+from datetime import datetime as dt
+from typing import Type
+
+from sqlalchemy import case, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.crud import user_donation_summary_crud
+from app.models import (
+    CharityProject, Donation, InvestingBaseModel, Investment
+)
+from app.services.fundraising_summary import record_set_based_allocation
+
+
+def get_open_capacity_query(model: Type[InvestingBaseModel]):
+    """
+    Подзапрос незакрытых объектов с остатком, нарастающим итогом
+    остатков и порядковым номером в порядке даты создания.
+    """
+    remaining = model.full_amount - model.invested_amount
+    order_by = (model.create_date, model.id)
+    return select(
+        model.id,
+        remaining.label('remaining'),
+        func.sum(remaining).over(order_by=order_by).label('running'),
+        func.count().over(order_by=order_by).label('position'),
+    ).where(
+        model.fully_invested.is_(False)
+    ).subquery()
+
+
+async def sql_investing_process(
+        target: InvestingBaseModel,
+        source_model: Type[InvestingBaseModel],
+        session: AsyncSession,
+) -> int:
+    """
+    Процесс «инвестирования» на стороне БД.
+    Переводы записываются одним INSERT … SELECT, источники, которые
+    закрываются целиком, обновляются одним запросом, последний частично
+    инвестированный источник — вторым.
+    Итог цели считается до её записи, поэтому новая цель вставляется
+    сразу с вложенной суммой, без отдельного обновления.
+    Если число обновлённых строк не совпало с прочитанным, источники
+    изменила параллельная транзакция, и поднимается StaleDataError.
+    Итоги сбора средств и счётчики пользователей по источникам
+    обновляются приращениями в той же транзакции.
+    Возвращает вложенную в цель сумму.
+    """
+    amount = target.full_amount - (target.invested_amount or 0)
+    open_capacity = get_open_capacity_query(source_model)
+    with session.no_autoflush:
+        last_source = (await session.execute(
+            select(
+                open_capacity.c.id,
+                open_capacity.c.remaining,
+                open_capacity.c.running,
+                open_capacity.c.position,
+            ).where(
+                open_capacity.c.running - open_capacity.c.remaining < amount
+            ).order_by(
+                open_capacity.c.running.desc()
+            ).limit(1)
+        )).first()
+    if last_source is None:
+        return 0
+    now = dt.now()
+    invested = min(amount, last_source.running)
+    target.invested_amount = (target.invested_amount or 0) + invested
+    if target.invested_amount == target.full_amount:
+        target.fully_invested = True
+        target.close_date = now
+    await session.flush()
+    target_id = literal(target.id)
+    donation_id, project_id = target_id, open_capacity.c.id
+    if isinstance(target, CharityProject):
+        donation_id, project_id = project_id, donation_id
+    await session.execute(
+        insert(Investment).from_select(
+            ['donation_id', 'project_id', 'amount', 'create_date'],
+            select(
+                donation_id,
+                project_id,
+                case(
+                    (
+                        open_capacity.c.running <= amount,
+                        open_capacity.c.remaining
+                    ),
+                    else_=(
+                        amount - open_capacity.c.running +
+                        open_capacity.c.remaining
+                    )
+                ),
+                literal(now),
+            ).where(
+                open_capacity.c.running - open_capacity.c.remaining < amount
+            )
+        )
+    )
+    closed_count = last_source.position
+    if last_source.running > amount:
+        closed_count -= 1
+    if closed_count:
+        closed = await session.execute(
+            update(source_model).where(
+                source_model.id.in_(
+                    select(open_capacity.c.id).where(
+                        open_capacity.c.running <= amount
+                    )
+                ),
+                source_model.fully_invested.is_(False),
+            ).values(
+                invested_amount=source_model.full_amount,
+                fully_invested=True,
+                close_date=now,
+                version=source_model.version + 1,
+            ).execution_options(synchronize_session=False)
+        )
+        if closed.rowcount != closed_count:
+            raise StaleDataError(source_model.__tablename__)
+    if last_source.running > amount:
+        partial = await session.execute(
+            update(source_model).where(
+                source_model.id == last_source.id,
+                source_model.full_amount - source_model.invested_amount ==
+                last_source.remaining,
+            ).values(
+                invested_amount=(
+                    source_model.invested_amount + amount -
+                    last_source.running + last_source.remaining
+                ),
+                version=source_model.version + 1,
+            ).execution_options(synchronize_session=False)
+        )
+        if partial.rowcount != 1:
+            raise StaleDataError(source_model.__tablename__)
+    await record_set_based_allocation(
+        session, source_model, invested, closed_count
+    )
+    if source_model is Donation:
+        await user_donation_summary_crud.add_project_allocation(
+            session, target.id
+        )
+    return invested
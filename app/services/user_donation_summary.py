@@ -0,0 +1,56 @@
+from collections import Counter, defaultdict
+from typing import DefaultDict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import user_donation_summary_crud
+from app.models import Donation
+from app.services.fundraising_summary import (
+    UNKNOWN_VALUES, get_flushed_changes
+)
+
+
+def get_user_contribution(values: Tuple) -> Counter:
+    """
+    Вклад одного пожертвования в счётчики пользователя по значениям
+    из get_flushed_changes; признак закрытия в счётчики не входит.
+    """
+    full_amount, invested_amount, _ = values
+    return Counter(
+        donation_count=1,
+        total_donated=full_amount,
+        total_allocated=invested_amount,
+    )
+
+
+@event.listens_for(Session, 'after_flush')
+def update_user_donation_summaries(session, flush_context):
+    """
+    Приращение счётчиков пользователей по записанным пожертвованиям
+    в той же транзакции. Если прежние значения изменённого пожертвования
+    неизвестны, счётчики его владельца пересчитываются целиком.
+    """
+    deltas: DefaultDict[int, Counter] = defaultdict(Counter)
+    recalculate = set()
+    for obj, committed, current in get_flushed_changes(session, Donation):
+        if obj.user_id is None:
+            continue
+        if committed is UNKNOWN_VALUES:
+            recalculate.add(obj.user_id)
+            continue
+        if committed is not None:
+            deltas[obj.user_id].subtract(get_user_contribution(committed))
+        if current is not None:
+            deltas[obj.user_id].update(get_user_contribution(current))
+    for user_id in recalculate:
+        deltas.pop(user_id, None)
+        user_donation_summary_crud.recalculate(session.connection(), user_id)
+    for user_id, user_deltas in deltas.items():
+        user_deltas = {
+            field: delta for field, delta in user_deltas.items() if delta
+        }
+        if user_deltas:
+            user_donation_summary_crud.apply(
+                session.connection(), user_id, user_deltas
+            )
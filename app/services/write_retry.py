@@ -0,0 +1,85 @@
+import asyncio
+import random
+from collections import Counter
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core import settings
+
+LOCK_ERROR_MESSAGES = ('database is locked', 'database table is locked')
+
+T = TypeVar('T')
+
+
+def is_lock_contention(error: BaseException) -> bool:
+    """Ошибка SQLite о занятой другим соединением БД или таблице."""
+    return isinstance(error, OperationalError) and any(
+        message in str(error.orig).lower() for message in LOCK_ERROR_MESSAGES
+    )
+
+
+def get_retry_reason(error: BaseException) -> Optional[str]:
+    """Причина, по которой транзакцию можно повторить, или None."""
+    if isinstance(error, StaleDataError):
+        return 'stale'
+    if is_lock_contention(error):
+        return 'locked'
+    return None
+
+
+def get_retry_delay(attempt: int) -> float:
+    """
+    Пауза перед повтором: случайная в пределах экспоненциально
+    растущего окна, чтобы столкнувшиеся писатели расходились.
+    """
+    return random.uniform(0, min(
+        settings.write_retry_delay * 2 ** attempt,
+        settings.write_retry_max_delay,
+    ))
+
+
+class WriteRetry:
+    """
+    Повтор транзакций записи, прерванных конфликтом версий строк
+    или блокировкой SQLite. Транзакция откатывается и выполняется
+    с нуля, пока не кончатся попытки или общее время на запрос.
+    В stats считаются повторы, исчерпанные попытки и время ожидания.
+    """
+
+    def __init__(self):
+        self.stats = Counter()
+
+    async def run(
+            self,
+            operation: Callable[[], Awaitable[T]],
+            session: AsyncSession,
+    ) -> T:
+        """Выполнение операции, фиксирующей транзакцию сессии."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.write_retry_deadline
+        attempt = 0
+        while True:
+            try:
+                return await operation()
+            except (OperationalError, StaleDataError) as error:
+                reason = get_retry_reason(error)
+                if reason is None:
+                    raise
+                await session.rollback()
+                delay = get_retry_delay(attempt)
+                if (
+                    attempt >= settings.write_retries or
+                    loop.time() + delay > deadline
+                ):
+                    self.stats[f'{reason}_exhausted'] += 1
+                    raise
+                attempt += 1
+                self.stats[f'{reason}_retries'] += 1
+                self.stats['wait_ms'] += round(delay * 1000)
+                await asyncio.sleep(delay)
+
+
+write_retry = WriteRetry()
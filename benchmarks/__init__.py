@@ -0,0 +1 @@
+"""Нагрузочные сценарии распределения пожертвований."""
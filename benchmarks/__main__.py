@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import os
+
+DEFAULT_DATABASE_URL = 'sqlite+aiosqlite:///./benchmark.db'
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Нагрузочные сценарии распределения пожертвований.',
+    )
+    parser.add_argument(
+        'scenarios', nargs='*',
+        help='сценарии для запуска, по умолчанию все',
+    )
+    parser.add_argument(
+        '--scale', type=int, default=1,
+        help='множитель числа объектов и запросов в сценариях',
+    )
+    parser.add_argument(
+        '--database-url', default=DEFAULT_DATABASE_URL,
+        help='БД для сценариев через API, её таблицы пересоздаются',
+    )
+    parser.add_argument('--engine', choices=('python', 'sql'))
+    parser.add_argument('--sources', choices=('ledger', 'stream'))
+    parser.add_argument(
+        '--worker', action='store_true',
+        help='распределять средства через исполнитель с групповой фиксацией',
+    )
+    parser.add_argument('--output', help='файл для сохранения результатов')
+    parser.add_argument(
+        '--compare', help='файл прошлого прогона для сравнения',
+    )
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.core import settings
+    from app.services import allocation_worker
+    from benchmarks.runner import format_results, load_results, save_results
+    from benchmarks.scenarios import SCENARIOS
+
+    if args.engine:
+        settings.investing_engine = args.engine
+    if args.sources:
+        settings.investing_sources = args.sources
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f'Неизвестные сценарии: {", ".join(sorted(unknown))}')
+    if args.worker:
+        await allocation_worker.start()
+    try:
+        results = [
+            await SCENARIOS[name](args.scale)
+            for name in args.scenarios or SCENARIOS
+        ]
+    finally:
+        await allocation_worker.stop()
+    baseline = load_results(args.compare) if args.compare else None
+    print(format_results(results, baseline))
+    if args.output:
+        save_results(args.output, results, dict(
+            scale=args.scale,
+            investing_engine=settings.investing_engine,
+            investing_sources=settings.investing_sources,
+            allocation_worker=args.worker,
+        ))
+
+
+def main() -> None:
+    args = parse_args()
+    # Настройки читаются при импорте приложения, поэтому БД подменяется
+    # до него: сценарии пересоздают таблицы и не должны трогать рабочую БД.
+    os.environ['DATABASE_URL'] = args.database_url
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
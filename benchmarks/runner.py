@@ -0,0 +1,155 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime as dt
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """Перцентиль по методу ближайшего ранга."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(math.ceil(rank / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+@dataclass
+class BenchmarkResult:
+    """Результат прогона одного сценария."""
+    name: str
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    queries: int = 0
+    errors: int = 0
+
+    @property
+    def operations(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.operations / self.seconds if self.seconds else 0.0
+
+    @property
+    def queries_per_op(self) -> float:
+        return self.queries / self.operations if self.operations else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Сводка результата для вывода и сохранения в JSON."""
+        return dict(
+            name=self.name,
+            operations=self.operations,
+            seconds=round(self.seconds, 4),
+            ops_per_sec=round(self.ops_per_sec, 2),
+            p50_ms=round(percentile(self.latencies, 50) * 1000, 3),
+            p99_ms=round(percentile(self.latencies, 99) * 1000, 3),
+            queries_per_op=round(self.queries_per_op, 2),
+            errors=self.errors,
+        )
+
+
+class Timer:
+    """Замер длительности сценария и задержек отдельных операций."""
+
+    def __init__(self, result: BenchmarkResult):
+        self.result = result
+
+    @contextmanager
+    def operation(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.result.latencies.append(time.perf_counter() - start)
+
+    @contextmanager
+    def total(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.result.seconds += time.perf_counter() - start
+
+
+@contextmanager
+def count_queries(engine: Optional[AsyncEngine], result: BenchmarkResult):
+    """Подсчёт SQL-запросов, выполненных движком внутри блока."""
+    if engine is None:
+        yield
+        return
+
+    def before_cursor_execute(*args, **kwargs):
+        result.queries += 1
+
+    event.listen(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+    try:
+        yield
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+        )
+
+
+def save_results(
+    path: str,
+    results: List[BenchmarkResult],
+    options: Dict[str, object],
+) -> None:
+    """Сохранение результатов прогона в JSON для сравнения с другими."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(
+            dict(
+                date=dt.now().isoformat(timespec='seconds'),
+                options=options,
+                results=[result.as_dict() for result in results],
+            ),
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    """Результаты сохранённого прогона по названиям сценариев."""
+    with open(path, encoding='utf-8') as file:
+        return {
+            result['name']: result for result in json.load(file)['results']
+        }
+
+
+def format_results(
+    results: List[BenchmarkResult],
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+) -> str:
+    """
+    Таблица результатов. Если передан прошлый прогон, рядом
+    с показателями выводится их изменение относительно него.
+    """
+    columns = ('ops_per_sec', 'p50_ms', 'p99_ms', 'queries_per_op')
+    lines = ['{:<22}{:>10}'.format('scenario', 'ops') + ''.join(
+        f'{column:>24}' for column in columns
+    )]
+    for result in results:
+        summary = result.as_dict()
+        previous = (baseline or {}).get(result.name)
+        cells = []
+        for column in columns:
+            cell = f'{summary[column]}'
+            if previous and previous.get(column):
+                change = summary[column] / previous[column] - 1
+                cell += f' ({change:+.1%})'
+            cells.append(f'{cell:>24}')
+        if result.errors:
+            cells.append(f'  errors: {result.errors}')
+        lines.append(
+            f'{result.name:<22}{result.operations:>10}' + ''.join(cells)
+        )
+    return '\n'.join(lines)
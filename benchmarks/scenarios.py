@@ -0,0 +1,301 @@
+import asyncio
+import random
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.endpoints.charity_project import PROJECT_COLUMNS
+from app.api.serialization import rows_response
+from app.core import Base, current_superuser, current_user
+from app.core.db import AsyncSessionLocal, engine, read_engine
+from app.core.init_db import create_user
+from app.crud import charity_project_crud
+from app.main import app
+from app.models import CharityProject, Donation, InvestingBaseModel, User
+from app.schemas import CharityProjectDB
+from app.services import investing_process, warm_ledgers
+from benchmarks.runner import BenchmarkResult, Timer, count_queries
+
+START_DATE = datetime(2010, 10, 10)
+SEED = 2022
+LOGIN_EMAIL = 'login@example.com'
+LOGIN_PASSWORD = 'benchmark password'
+
+benchmark_user = User(
+    id=1,
+    email='benchmark@example.com',
+    hashed_password='',
+    is_active=True,
+    is_verified=True,
+    is_superuser=True,
+)
+
+
+def make_objs(model, amounts: List[int]) -> List[InvestingBaseModel]:
+    """Несохранённые объекты с заданными суммами в порядке создания."""
+    return [
+        model(
+            id=number,
+            full_amount=amount,
+            invested_amount=0,
+            fully_invested=False,
+            create_date=START_DATE + timedelta(seconds=number),
+        )
+        for number, amount in enumerate(amounts, 1)
+    ]
+
+
+def run_investing_process(
+    name: str,
+    targets: List[InvestingBaseModel],
+    sources: List[InvestingBaseModel],
+) -> BenchmarkResult:
+    """
+    Последовательное распределение целей по очереди источников в памяти,
+    без обращений к БД. Закрытые источники снимаются с головы очереди.
+    """
+    result = BenchmarkResult(name)
+    timer = Timer(result)
+    open_sources = deque(sources)
+    with timer.total():
+        for target in targets:
+            with timer.operation():
+                investing_process(target, open_sources)
+                while open_sources and open_sources[0].fully_invested:
+                    open_sources.popleft()
+    return result
+
+
+async def tiny_donations(scale: int) -> BenchmarkResult:
+    """Много мелких пожертвований в несколько крупных проектов."""
+    rand = random.Random(SEED)
+    return run_investing_process(
+        'tiny_donations',
+        make_objs(
+            Donation, [rand.randint(1, 100) for _ in range(20000 * scale)]
+        ),
+        make_objs(CharityProject, [10 ** 9] * 10),
+    )
+
+
+async def huge_donations(scale: int) -> BenchmarkResult:
+    """Несколько крупных пожертвований, закрывающих тысячи проектов."""
+    rand = random.Random(SEED)
+    amounts = [rand.randint(100, 1000) for _ in range(5000 * scale)]
+    return run_investing_process(
+        'huge_donations',
+        make_objs(Donation, [sum(amounts) // 10] * 10),
+        make_objs(CharityProject, amounts),
+    )
+
+
+async def reset_database(project_amounts: List[int]) -> None:
+    """Пересоздание таблиц и заполнение открытыми проектами."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        session.add_all(
+            CharityProject(
+                name=f'benchmark {number}',
+                description='benchmark',
+                full_amount=amount,
+                create_date=START_DATE + timedelta(seconds=number),
+            )
+            for number, amount in enumerate(project_amounts, 1)
+        )
+        await session.commit()
+    await warm_ledgers()
+
+
+async def run_requests(
+    name: str,
+    requests: List[List[Dict[str, object]]],
+) -> BenchmarkResult:
+    """
+    Отправка запросов в приложение через ASGI-транспорт httpx.
+    Каждый вложенный список — последовательность запросов одного клиента,
+    клиенты работают одновременно.
+    """
+    result = BenchmarkResult(name)
+    timer = Timer(result)
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[current_user] = lambda: benchmark_user
+    app.dependency_overrides[current_superuser] = lambda: benchmark_user
+
+    async def send(client: AsyncClient, queue: List[Dict[str, object]]):
+        for request in queue:
+            with timer.operation():
+                response = await client.request(**request)
+            if response.is_error:
+                result.errors += 1
+
+    try:
+        async with AsyncClient(app=app, base_url='http://test') as client:
+            with (
+                count_queries(engine, result),
+                count_queries(read_engine, result),
+                timer.total(),
+            ):
+                await asyncio.gather(*(
+                    send(client, queue) for queue in requests
+                ))
+    finally:
+        app.dependency_overrides = overrides
+    return result
+
+
+def donation_request(amount: int) -> Dict[str, object]:
+    return dict(method='POST', url='/donation/', json={'full_amount': amount})
+
+
+async def api_tiny_donations(scale: int) -> BenchmarkResult:
+    """Мелкие пожертвования через POST /donation/ по одному."""
+    rand = random.Random(SEED)
+    await reset_database([10 ** 9] * 10)
+    return await run_requests('api_tiny_donations', [[
+        donation_request(rand.randint(1, 100)) for _ in range(200 * scale)
+    ]])
+
+
+async def api_huge_donations(scale: int) -> BenchmarkResult:
+    """Крупные пожертвования через API, закрывающие тысячи проектов."""
+    rand = random.Random(SEED)
+    amounts = [rand.randint(100, 1000) for _ in range(2000 * scale)]
+    await reset_database(amounts)
+    return await run_requests('api_huge_donations', [
+        [donation_request(sum(amounts) // 10)] * 10
+    ])
+
+
+async def api_mixed_traffic(scale: int) -> BenchmarkResult:
+    """
+    Одновременные клиенты вперемешку жертвуют, создают проекты
+    и читают список проектов.
+    """
+    rand = random.Random(SEED)
+    await reset_database([rand.randint(100, 10000) for _ in range(50)])
+    requests = []
+    for client_number in range(10):
+        queue = []
+        for number in range(50 * scale):
+            kind = rand.choices(
+                ('donation', 'project', 'list'), weights=(7, 1, 2)
+            )[0]
+            if kind == 'donation':
+                queue.append(donation_request(rand.randint(1, 1000)))
+            elif kind == 'project':
+                queue.append(dict(
+                    method='POST',
+                    url='/charity_project/',
+                    json={
+                        'name': f'mixed {client_number} {number}',
+                        'description': 'benchmark',
+                        'full_amount': rand.randint(100, 10000),
+                    },
+                ))
+            else:
+                queue.append(dict(method='GET', url='/charity_project/'))
+        requests.append(queue)
+    return await run_requests('api_mixed_traffic', requests)
+
+
+async def run_list_serialization(
+    name: str,
+    scale: int,
+    serialize: Callable[[AsyncSession], Awaitable[bytes]],
+) -> BenchmarkResult:
+    """Чтение и сериализация списка проектов без HTTP-слоя."""
+    await reset_database([100] * 5000 * scale)
+    result = BenchmarkResult(name)
+    timer = Timer(result)
+    with count_queries(engine, result), timer.total():
+        for _ in range(20):
+            with timer.operation():
+                async with AsyncSessionLocal() as session:
+                    await serialize(session)
+    return result
+
+
+async def list_projects_validated(scale: int) -> BenchmarkResult:
+    """Список проектов через ORM-объекты и валидацию схемой ответа."""
+    async def serialize(session: AsyncSession) -> bytes:
+        projects = await charity_project_crud.get_page(session)
+        return JSONResponse(jsonable_encoder(
+            [CharityProjectDB.from_orm(project) for project in projects],
+            exclude_none=True,
+        )).body
+
+    return await run_list_serialization(
+        'list_projects_validated', scale, serialize
+    )
+
+
+async def list_projects_rows(scale: int) -> BenchmarkResult:
+    """Список проектов из строк столбцов, закодированных orjson."""
+    async def serialize(session: AsyncSession) -> bytes:
+        projects = await charity_project_crud.get_page(
+            session, columns=PROJECT_COLUMNS
+        )
+        return rows_response(projects).body
+
+    return await run_list_serialization('list_projects_rows', scale, serialize)
+
+
+async def api_login_storm(scale: int) -> BenchmarkResult:
+    """
+    Пожертвования через API, пока одновременные клиенты непрерывно
+    входят по паролю. Задержки пожертвований показывают, задерживает ли
+    проверка паролей bcrypt цикл событий; сравните с прогоном
+    при PASSWORD_HASH_CONCURRENCY=0.
+    """
+    rand = random.Random(SEED)
+    await reset_database([10 ** 9] * 10)
+    await create_user(LOGIN_EMAIL, LOGIN_PASSWORD)
+    finished = asyncio.Event()
+
+    async def log_in(client: AsyncClient):
+        while not finished.is_set():
+            await client.post('/auth/jwt/login', data={
+                'username': LOGIN_EMAIL, 'password': LOGIN_PASSWORD,
+            })
+
+    async with AsyncClient(app=app, base_url='http://test') as client:
+        logins = [asyncio.create_task(log_in(client)) for _ in range(8)]
+        try:
+            return await run_requests('api_login_storm', [[
+                donation_request(rand.randint(1, 100))
+                for _ in range(50 * scale)
+            ]])
+        finally:
+            finished.set()
+            await asyncio.gather(*logins)
+
+
+async def api_list_projects(scale: int) -> BenchmarkResult:
+    """GET /charity_project/ по таблице из тысяч проектов."""
+    await reset_database([100] * 5000 * scale)
+    return await run_requests('api_list_projects', [
+        [dict(method='GET', url='/charity_project/')] * 20
+    ])
+
+
+SCENARIOS: Dict[str, Callable[[int], Awaitable[BenchmarkResult]]] = {
+    scenario.__name__: scenario
+    for scenario in (
+        tiny_donations,
+        huge_donations,
+        api_tiny_donations,
+        api_huge_donations,
+        api_mixed_traffic,
+        api_login_storm,
+        list_projects_validated,
+        list_projects_rows,
+        api_list_projects,
+    )
+}
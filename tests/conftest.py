@@ -16,7 +16,9 @@ except (NameError, ImportError):
     )
 
 try:
-    from app.core.db import Base, get_async_session
+    from app.core.db import (
+        Base, get_async_session, get_read_only_url, get_read_session
+    )
 except (NameError, ImportError):
     raise AssertionError(
         'Не обнаружены объекты `Base, get_async_session`. '
@@ -42,12 +44,15 @@ except (NameError, ImportError):
         '`app.schemas.user`.',
     )
 
+from app.core.user_cache import user_cache
+from app.services import project_cache
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 
 pytest_plugins = [
     'fixtures.user',
     'fixtures.data',
+    'fixtures.investing',
 ]
 
 TEST_DB = BASE_DIR / 'test.db'
@@ -58,6 +63,14 @@ engine = create_async_engine(
 )
 TestingSessionLocal = sessionmaker(
     class_=AsyncSession, autocommit=False, autoflush=False, bind=engine,
+    expire_on_commit=False,
+)
+read_engine = create_async_engine(
+    get_read_only_url(SQLALCHEMY_DATABASE_URL),
+    connect_args={'check_same_thread': False},
+)
+TestingReadSessionLocal = sessionmaker(
+    class_=AsyncSession, bind=read_engine, expire_on_commit=False,
 )
 
 
@@ -66,6 +79,11 @@ async def override_db():
         yield session
 
 
+async def override_read_db():
+    async with TestingReadSessionLocal() as session:
+        yield session
+
+
 @pytest_asyncio.fixture(autouse=True)
 async def init_db():
     async with engine.begin() as conn:
@@ -73,6 +91,8 @@ async def init_db():
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    project_cache.invalidate()
+    user_cache.invalidate()
 
 
 @pytest.fixture
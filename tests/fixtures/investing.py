@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import (
+    app, current_superuser, current_user, get_async_session, get_read_session,
+    override_db, override_read_db
+)
+from fastapi.testclient import TestClient
+from fixtures.user import superuser
+
+from app.core import settings
+
+
+@pytest.fixture(params=['python', 'stream', 'sql'])
+def investing_engine(request, monkeypatch):
+    if request.param == 'stream':
+        monkeypatch.setattr(settings, 'investing_sources', 'stream')
+    else:
+        monkeypatch.setattr(settings, 'investing_engine', request.param)
+    return request.param
+
+
+@pytest.fixture
+def client(investing_engine):
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[get_read_session] = override_read_db
+    app.dependency_overrides[current_user] = lambda: superuser
+    app.dependency_overrides[current_superuser] = lambda: superuser
+    with TestClient(app) as client:
+        yield client
+
+
+def blend_projects(mixer, amounts, prefix='project'):
+    start = datetime(2010, 10, 10)
+    return [
+        mixer.blend(
+            'app.models.charity_project.CharityProject',
+            name=f'{prefix} {number}',
+            description='engine',
+            full_amount=amount,
+            create_date=start + timedelta(days=number),
+        )
+        for number, amount in enumerate(amounts)
+    ]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from conftest import TestingSessionLocal
+from fixtures.user import user
+
+from app.crud import charity_project_crud, donation_crud
+from app.schemas import (
+    CharityProjectCreate, CharityProjectDB, DonationCreate, DonationDB
+)
+from app.services.allocation_worker import AllocationWorker
+
+
+@pytest.fixture
+async def worker():
+    worker = AllocationWorker(session_factory=TestingSessionLocal)
+    await worker.start()
+    yield worker
+    await worker.stop()
+
+
+async def test_worker_group_commits_concurrent_donations(worker, mixer):
+    mixer.blend(
+        'app.models.charity_project.CharityProject',
+        name='worker',
+        description='worker',
+        full_amount=1000,
+    )
+    donations = await asyncio.gather(*(
+        worker.submit(
+            crud=donation_crud,
+            obj_in=DonationCreate(full_amount=15),
+            schema=DonationDB,
+            user=user,
+        )
+        for _ in range(100)
+    ))
+    assert sorted(donation.id for donation in donations) == list(
+        range(1, 101)
+    ), 'Каждая заявка должна получить свой созданный объект.'
+    assert worker.batches < 100, (
+        'Одновременные заявки должны фиксироваться пачками.'
+    )
+    async with TestingSessionLocal() as session:
+        project = await charity_project_crud.get(1, session)
+        invested = sum(
+            obj.invested_amount
+            for obj in await donation_crud.get_multi(session)
+        )
+    assert project.fully_invested and invested == 1000, (
+        'При параллельных пожертвованиях не должно быть потерянных '
+        'обновлений.'
+    )
+
+
+async def test_worker_isolates_failed_job(worker):
+    project = CharityProjectCreate(
+        name='duplicate', description='worker', full_amount=10
+    )
+    results = await asyncio.gather(
+        worker.submit(
+            crud=charity_project_crud,
+            obj_in=project,
+            schema=CharityProjectDB,
+        ),
+        worker.submit(
+            crud=charity_project_crud,
+            obj_in=project,
+            schema=CharityProjectDB,
+        ),
+        worker.submit(
+            crud=donation_crud,
+            obj_in=DonationCreate(full_amount=5),
+            schema=DonationDB,
+            user=user,
+        ),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], CharityProjectDB)
+    assert isinstance(results[1], Exception), (
+        'Ошибка одной заявки должна возвращаться только её отправителю.'
+    )
+    assert results[2].full_amount == 5
@@ -0,0 +1,32 @@
+from benchmarks.runner import (
+    BenchmarkResult, format_results, load_results, percentile, save_results
+)
+from benchmarks.scenarios import huge_donations
+
+
+def test_percentile():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 99) == 0
+
+
+async def test_in_memory_scenario():
+    result = await huge_donations(1)
+    assert result.operations == 10, (
+        'Каждое пожертвование должно быть отдельной операцией.'
+    )
+    assert result.queries == 0 and result.ops_per_sec > 0
+
+
+def test_results_round_trip(tmp_path):
+    result = BenchmarkResult('scenario', seconds=2, queries=8)
+    result.latencies.extend([0.1, 0.3, 0.2, 0.4])
+    path = tmp_path / 'results.json'
+    save_results(path, [result], dict(scale=1))
+    saved = load_results(path)['scenario']
+    assert saved['ops_per_sec'] == 2 and saved['queries_per_op'] == 2
+    assert saved['p50_ms'] == 200 and saved['p99_ms'] == 400
+    assert '(+0.0%)' in format_results([result], load_results(path)), (
+        'Сравнение с прошлым прогоном должно показывать изменение.'
+    )
@@ -0,0 +1,80 @@
+from fixtures.investing import blend_projects
+
+from app.constants import MAX_BULK_DONATIONS
+from app.models import CharityProject, Donation
+from app.services import investing_process
+
+PROJECT_AMOUNTS = [100, 200, 300, 400, 500, 50]
+DONATION_AMOUNTS = [30, 500, 70, 1, 399, 120, 200]
+
+
+def sequential_allocation(project_amounts, donation_amounts):
+    projects = [
+        CharityProject(full_amount=amount, invested_amount=0)
+        for amount in project_amounts
+    ]
+    donations = [
+        Donation(full_amount=amount, invested_amount=0)
+        for amount in donation_amounts
+    ]
+    for donation in donations:
+        investing_process(
+            donation,
+            [project for project in projects if not project.fully_invested]
+        )
+    return (
+        [project.invested_amount for project in projects],
+        [donation.invested_amount for donation in donations],
+    )
+
+
+def test_bulk_matches_sequential(client, mixer):
+    blend_projects(mixer, PROJECT_AMOUNTS)
+    response = client.post('/donation/bulk', json=[
+        {'full_amount': amount, 'comment': f'bulk {number}'}
+        for number, amount in enumerate(DONATION_AMOUNTS)
+    ])
+    assert response.status_code == 200, (
+        'При пакетном создании пожертвований должен возвращаться '
+        'статус-код 200.'
+    )
+    data = response.json()
+    assert [donation['full_amount'] for donation in data] == (
+        DONATION_AMOUNTS
+    ), 'Пожертвования должны возвращаться в порядке отправки.'
+    assert sorted(data[0].keys()) == sorted(
+        ['full_amount', 'id', 'create_date', 'comment']
+    )
+    expected_projects, expected_donations = sequential_allocation(
+        PROJECT_AMOUNTS, DONATION_AMOUNTS
+    )
+    projects = client.get('/charity_project/').json()
+    donations = client.get('/donation/').json()
+    assert [project['invested_amount'] for project in projects] == (
+        expected_projects
+    ), 'Пакет должен распределяться так же, как последовательные запросы.'
+    assert [donation['invested_amount'] for donation in donations] == (
+        expected_donations
+    ), 'Пакет должен распределяться так же, как последовательные запросы.'
+
+
+def test_bulk_size_limits(user_client):
+    assert user_client.post('/donation/bulk', json=[]).status_code == 422
+    response = user_client.post(
+        '/donation/bulk',
+        json=[{'full_amount': 1}] * (MAX_BULK_DONATIONS + 1)
+    )
+    assert response.status_code == 422, (
+        'Пакет больше допустимого размера должен отклоняться.'
+    )
+
+
+def test_bulk_validates_items(user_client):
+    response = user_client.post('/donation/bulk', json=[
+        {'full_amount': 10},
+        {'full_amount': -1},
+    ])
+    assert response.status_code == 422, (
+        'Пакет с некорректным пожертвованием должен отклоняться целиком.'
+    )
+    assert user_client.get('/donation/my').json() == []
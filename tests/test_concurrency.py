@@ -0,0 +1,192 @@
+import asyncio
+from datetime import datetime
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from conftest import (
+    TestingSessionLocal, app, current_user, get_async_session,
+    get_read_session, override_db, override_read_db
+)
+from fixtures.investing import blend_projects
+from fixtures.user import superuser
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.crud import CRUDBase, charity_project_crud
+from app.models import CharityProject
+from app.services import investing, write_retry
+from app.services.ledger import OpenCapacityLedger
+
+
+async def test_stale_version_rejected(charity_project):
+    async with TestingSessionLocal() as first, TestingSessionLocal() as second:
+        first_project = await charity_project_crud.get(
+            charity_project.id, first
+        )
+        second_project = await charity_project_crud.get(
+            charity_project.id, second
+        )
+        first_project.invested_amount += 10
+        await first.commit()
+        second_project.invested_amount += 20
+        with pytest.raises(StaleDataError):
+            await second.commit()
+
+
+def test_allocation_retries_on_conflict(client, mixer, monkeypatch):
+    [project] = blend_projects(mixer, [1000])
+    invest_many = investing.invest_many
+    calls = []
+
+    async def conflicting_invest_many(targets, session):
+        calls.append(targets)
+        if len(calls) == 1:
+            raise StaleDataError('charityproject')
+        await invest_many(targets, session)
+
+    monkeypatch.setattr(investing, 'invest_many', conflicting_invest_many)
+    response = client.post('/donation/', json={'full_amount': 100})
+    assert response.status_code == 200, (
+        'Конфликт версий должен приводить к повтору, а не к ошибке.'
+    )
+    assert len(calls) == 2
+    assert response.json()['id'] == 1, (
+        'Откатанная попытка не должна оставлять пожертвований.'
+    )
+    investments = client.get(f'/charity_project/{project.id}/investments')
+    assert [
+        investment['amount'] for investment in investments.json()
+    ] == [100], 'Средства должны быть распределены ровно один раз.'
+
+
+@pytest.mark.parametrize('dialect_name, expected', [
+    ('postgresql', True),
+    ('sqlite', False),
+])
+def test_skip_locked_where_supported(dialect_name, expected):
+    session = SimpleNamespace(
+        bind=SimpleNamespace(dialect=SimpleNamespace(name=dialect_name))
+    )
+    query = CRUDBase.lock_for_allocation(select(CharityProject), session)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert ('FOR UPDATE SKIP LOCKED' in sql) is expected, (
+        'Блокировка SKIP LOCKED должна использоваться только там, '
+        'где БД её поддерживает.'
+    )
+
+
+class PostgresSession:
+    """Сессия-заглушка, которая записывает запросы вместо выполнения."""
+
+    bind = SimpleNamespace(dialect=SimpleNamespace(name='postgresql'))
+
+    def __init__(self, rows=(), streamed=()):
+        self.rows = list(rows)
+        self.streamed = list(streamed)
+        self.queries = []
+
+    def compiled(self):
+        return [
+            str(query.compile(dialect=postgresql.dialect()))
+            for query in self.queries
+        ]
+
+    async def scalars(self, query):
+        self.queries.append(query)
+        return SimpleNamespace(all=lambda: self.rows)
+
+    async def stream_scalars(self, query):
+        self.queries.append(query)
+        return StreamedRows(self.streamed)
+
+
+class StreamedRows:
+    def __init__(self, rows):
+        self.rows = iter(rows)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.rows)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        pass
+
+
+async def test_head_rows_locked_without_skipping():
+    session = PostgresSession()
+    await charity_project_crud.get_by_ids([1, 2], session)
+    [sql] = session.compiled()
+    assert 'FOR UPDATE' in sql and 'SKIP LOCKED' not in sql, (
+        'Строки, выбранные реестром, должны ожидаться, а не пропускаться.'
+    )
+
+
+async def test_ledger_mismatch_streams_sources(monkeypatch):
+    ledger = OpenCapacityLedger(charity_project_crud)
+    ledger.load([
+        (1, datetime(2020, 1, 1), 10),
+        (2, datetime(2020, 1, 2), 10),
+    ])
+
+    async def in_sync(session):
+        return True
+
+    async def full_scan(session):
+        raise AssertionError('Полная выборка с блокировкой недопустима.')
+
+    monkeypatch.setattr(ledger, 'is_in_sync', in_sync)
+    monkeypatch.setattr(
+        charity_project_crud, 'get_not_fully_invested', full_scan
+    )
+    changed = CharityProject(id=1, full_amount=10, invested_amount=5)
+    streamed = [
+        changed, CharityProject(id=3, full_amount=10, invested_amount=0)
+    ]
+    session = PostgresSession(rows=[changed], streamed=streamed)
+    sources = [source async for source in ledger.get_sources(20, session)]
+    assert sources == streamed, (
+        'При расхождении с реестром источники должны читаться потоком.'
+    )
+    head_sql, stream_sql = session.compiled()
+    assert 'SKIP LOCKED' not in head_sql
+    assert 'FOR UPDATE SKIP LOCKED' in stream_sql
+    assert not ledger.is_warm
+
+
+async def test_concurrent_donations_succeed(investing_engine, mixer):
+    blend_projects(mixer, [30, 50, 1000])
+    app.dependency_overrides = {
+        get_async_session: override_db,
+        get_read_session: override_read_db,
+        current_user: lambda: superuser,
+    }
+    write_retry.stats.clear()
+    async with AsyncClient(app=app, base_url='http://test') as client:
+        responses = await asyncio.gather(*(
+            client.post('/donation/', json={'full_amount': 10})
+            for _ in range(20)
+        ))
+    assert [
+        response.status_code for response in responses
+    ] == [HTTPStatus.OK] * 20, (
+        'Одновременные пожертвования должны распределяться без ошибок.'
+    )
+    assert not write_retry.stats['stale_retries'], (
+        'Распределения на SQLite должны идти по очереди, без конфликтов '
+        'версий строк.'
+    )
+    async with TestingSessionLocal() as session:
+        invested = await session.scalars(
+            select(CharityProject.invested_amount).order_by(CharityProject.id)
+        )
+        assert invested.all() == [30, 50, 120], (
+            'Средства должны распределяться без потерянных обновлений.'
+        )
@@ -0,0 +1,69 @@
+from fixtures.investing import blend_projects
+
+from app.core import settings
+
+
+def get_with_etag(client, etag, **kwargs):
+    return client.get(
+        '/charity_project/', headers={'If-None-Match': etag}, **kwargs
+    )
+
+
+def test_not_modified_until_data_changes(client, mixer):
+    blend_projects(mixer, [100, 200])
+    response = client.get('/charity_project/')
+    etag = response.headers['ETag']
+    assert etag.startswith('W/'), 'ETag списка должен быть слабым.'
+    assert response.headers['Cache-Control'] == (
+        settings.project_list_cache_control
+    )
+    cached = get_with_etag(client, etag)
+    assert cached.status_code == 304 and cached.content == b'', (
+        'Неизменившийся список должен отдаваться ответом 304.'
+    )
+    assert cached.headers['ETag'] == etag
+    etags = {etag}
+    client.post('/donation/', json={'full_amount': 50})
+    etags.add(get_with_etag(client, etag).headers['ETag'])
+    project = client.post('/charity_project/', json={
+        'name': 'etag', 'description': 'etag', 'full_amount': 10,
+    }).json()
+    etags.add(get_with_etag(client, etag).headers['ETag'])
+    client.patch(
+        f'/charity_project/{project["id"]}',
+        json={'description': 'changed', 'full_amount': 20},
+    )
+    etags.add(get_with_etag(client, etag).headers['ETag'])
+    client.delete(f'/charity_project/{project["id"]}')
+    response = get_with_etag(client, etag)
+    assert response.status_code == 200
+    etags.add(response.headers['ETag'])
+    assert len(etags) == 5, (
+        'Создание, распределение, изменение и удаление должны менять ETag.'
+    )
+
+
+def test_etag_depends_on_representation(client, mixer):
+    blend_projects(mixer, [100])
+    etag = client.get('/charity_project/').headers['ETag']
+    assert get_with_etag(client, etag).status_code == 304
+    ndjson = client.get(
+        '/charity_project/',
+        headers={'If-None-Match': etag, 'Accept': 'application/x-ndjson'},
+    )
+    assert ndjson.status_code == 200 and ndjson.headers['ETag'] != etag, (
+        'Построчная выгрузка должна иметь свой ETag.'
+    )
+    assert ndjson.headers['Vary'] == 'Accept'
+    assert get_with_etag(client, f'"x", {etag[2:]}').status_code == 304, (
+        'If-None-Match должен сравниваться слабо и принимать список тегов.'
+    )
+
+
+def test_cache_control_configurable(client, monkeypatch):
+    monkeypatch.setattr(
+        settings, 'project_list_cache_control', 'public, max-age=30'
+    )
+    assert client.get(
+        '/charity_project/'
+    ).headers['Cache-Control'] == 'public, max-age=30'
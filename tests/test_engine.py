@@ -0,0 +1,56 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import Settings
+from app.core.db import (
+    get_engine_options, get_sqlite_pragmas, get_write_pragmas,
+    set_sqlite_pragmas
+)
+
+HIGH_THROUGHPUT = {
+    'engine_pool_size': 2,
+    'engine_max_overflow': 1,
+    'sqlite_busy_timeout': 3000,
+    'sqlite_journal_mode': 'wal',
+    'sqlite_synchronous': 'normal',
+    'sqlite_mmap_size': 1 << 20,
+    'sqlite_cache_size': -4096,
+}
+
+
+def test_default_engine_options():
+    settings = Settings(_env_file=None)
+    assert get_engine_options(settings) == {'query_cache_size': 500}, (
+        'Без размера пула должен использоваться пул по умолчанию.'
+    )
+    assert get_sqlite_pragmas(settings) == {'busy_timeout': 5000}
+    assert get_write_pragmas(settings) == {'busy_timeout': 100}, (
+        'При повторах записи блокировку должен ждать слой повторов.'
+    )
+
+
+async def test_pragmas_on_every_connection(tmp_path):
+    settings = Settings(_env_file=None, **HIGH_THROUGHPUT)
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path / "tuned.db"}',
+        **get_engine_options(settings),
+    )
+    set_sqlite_pragmas(engine, get_sqlite_pragmas(settings))
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            for connection in first, second:
+                values = [
+                    await connection.scalar(text(f'PRAGMA {pragma}'))
+                    for pragma in (
+                        'busy_timeout', 'journal_mode', 'synchronous',
+                        'mmap_size', 'cache_size',
+                    )
+                ]
+                assert values == [3000, 'wal', 1, 1 << 20, -4096], (
+                    'PRAGMA из настроек должны устанавливаться '
+                    'на каждом соединении.'
+                )
+    finally:
+        await engine.dispose()
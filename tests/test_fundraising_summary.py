@@ -0,0 +1,79 @@
+from conftest import TestingSessionLocal
+from fixtures.investing import blend_projects
+
+from app.crud.fundraising_summary import get_totals_query
+
+
+async def get_totals():
+    async with TestingSessionLocal() as session:
+        return (await session.execute(get_totals_query())).one()._asdict()
+
+
+async def test_stats_follow_writes(client, mixer):
+    blend_projects(mixer, [100, 200, 300])
+    assert client.get('/charity_project/stats').json() == {
+        'total_raised': 0,
+        'total_pledged': 600,
+        'open_project_count': 3,
+        'remaining_capacity': 600,
+        'unallocated_balance': 0,
+    }
+    client.post('/donation/', json={'full_amount': 150})
+    client.post('/donation/', json={'full_amount': 600})
+    assert client.get('/charity_project/stats').json() == {
+        'total_raised': 750,
+        'total_pledged': 600,
+        'open_project_count': 0,
+        'remaining_capacity': 0,
+        'unallocated_balance': 150,
+    }, 'Распределение должно обновлять итоги.'
+    project = client.post('/charity_project/', json={
+        'name': 'stats', 'description': 'stats', 'full_amount': 500,
+    }).json()
+    assert project['invested_amount'] == 150
+    stats = client.get('/charity_project/stats').json()
+    assert stats == {
+        'total_raised': 750,
+        'total_pledged': 1100,
+        'open_project_count': 1,
+        'remaining_capacity': 350,
+        'unallocated_balance': 0,
+    }
+    assert stats == await get_totals(), (
+        'Итоги должны совпадать с посчитанными по всем строкам.'
+    )
+
+
+async def test_stats_after_update_and_delete(client, mixer):
+    blend_projects(mixer, [100])
+    client.post('/donation/', json={'full_amount': 40})
+    client.patch('/charity_project/1', json={'full_amount': 40})
+    stats = client.get('/charity_project/stats').json()
+    assert stats['open_project_count'] == 0, (
+        'Проект, закрытый изменением суммы, не должен считаться открытым.'
+    )
+    assert stats == await get_totals()
+    project = client.post('/charity_project/', json={
+        'name': 'removed', 'description': 'removed', 'full_amount': 70,
+    }).json()
+    client.patch(
+        f'/charity_project/{project["id"]}',
+        json={'description': 'changed', 'full_amount': 90},
+    )
+    assert client.get('/charity_project/stats').json()['total_pledged'] == 130
+    client.delete(f'/charity_project/{project["id"]}')
+    stats = client.get('/charity_project/stats').json()
+    assert stats['total_pledged'] == 40 and stats['remaining_capacity'] == 0
+    assert stats == await get_totals(), (
+        'Удаление проекта должно вычитаться из итогов.'
+    )
+
+
+def test_stats_empty(client):
+    assert client.get('/charity_project/stats').json() == {
+        'total_raised': 0,
+        'total_pledged': 0,
+        'open_project_count': 0,
+        'remaining_capacity': 0,
+        'unallocated_balance': 0,
+    }
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+from conftest import TestingSessionLocal, engine
+from sqlalchemy import event, text
+
+from app.crud import charity_project_crud, donation_crud, investment_crud
+from app.models import User
+
+
+async def capture_statements(crud_call):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    try:
+        async with TestingSessionLocal() as session:
+            await crud_call(session)
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+    return statements
+
+
+async def explain(statement, parameters):
+    async with engine.connect() as conn:
+        plan = await conn.exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {statement}', parameters
+        )
+        return ' '.join(row[-1] for row in plan.all())
+
+
+async def stream_first(session):
+    async for _ in donation_crud.stream_not_fully_invested(session, 10):
+        break
+
+
+@pytest.mark.parametrize('crud_call, index_name', [
+    (
+        charity_project_crud.get_not_fully_invested,
+        'ix_charityproject_open_queue',
+    ),
+    (stream_first, 'ix_donation_open_queue'),
+    (
+        charity_project_crud.get_open_capacity,
+        'COVERING INDEX ix_charityproject_open_queue',
+    ),
+    (
+        lambda session: donation_crud.get_by_user(User(id=1), session),
+        'ix_donation_user_id_create_date',
+    ),
+    (
+        lambda session: charity_project_crud.get_page(
+            session, 10, (datetime(2010, 10, 10), 1)
+        ),
+        'ix_charityproject_create_date_id',
+    ),
+    (
+        lambda session: donation_crud.get_by_user(
+            User(id=1), session, 10, (datetime(2010, 10, 10), 1)
+        ),
+        'ix_donation_user_id_create_date',
+    ),
+    (
+        lambda session: investment_crud.get_by_project(
+            1, session, 10, (datetime(2010, 10, 10), 1)
+        ),
+        'ix_investment_project_id_create_date',
+    ),
+    (
+        lambda session: investment_crud.get_by_donation(
+            1, session, 10, (datetime(2010, 10, 10), 1)
+        ),
+        'ix_investment_donation_id_create_date',
+    ),
+])
+async def test_hot_queries_use_indexes(crud_call, index_name):
+    statements = await capture_statements(crud_call)
+    assert statements, 'CRUD-метод должен выполнить запрос к БД.'
+    for statement, parameters in statements:
+        plan = await explain(statement, parameters)
+        assert index_name in plan, (
+            f'Запрос `{statement}` должен использовать индекс '
+            f'`{index_name}`, план запроса: {plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            f'Сортировка в запросе `{statement}` должна идти по индексу.'
+        )
+
+
+async def test_models_declare_queue_indexes():
+    async with engine.connect() as conn:
+        indexes = await conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ))
+        names = set(indexes.scalars().all())
+    assert {
+        'ix_charityproject_open_queue',
+        'ix_donation_open_queue',
+        'ix_donation_user_id_create_date',
+    } <= names, 'Индексы очереди должны создаваться по моделям.'
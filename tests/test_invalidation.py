@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from conftest import TEST_DB, TestingSessionLocal, engine
+from sqlalchemy import create_engine
+
+from app.crud import data_version_crud
+from app.services.invalidation import (
+    DataVersionTransport, InvalidationBus, InvalidationTransport,
+    PollingTransport, SQLiteDataVersionTransport, invalidation_bus
+)
+from app.services.project_cache import project_cache
+
+INTERVAL = 0.01
+
+
+def bump_in_connection():
+    with create_engine(f'sqlite:///{TEST_DB}').begin() as connection:
+        data_version_crud.bump(connection)
+
+
+async def commit_from_other_worker():
+    """
+    Фиксация версии данных через отдельное соединение, как в другом
+    воркере. Запись идёт в потоке, чтобы не блокировать опрос шины.
+    """
+    await asyncio.to_thread(bump_in_connection)
+
+
+async def wait_notifications(bus, count, timeout=2):
+    async def notified():
+        while bus.stats['notifications'] < count:
+            await asyncio.sleep(INTERVAL)
+    await asyncio.wait_for(notified(), timeout)
+
+
+@pytest.mark.parametrize('transport', [
+    lambda: DataVersionTransport(INTERVAL, session_factory=TestingSessionLocal),
+    lambda: SQLiteDataVersionTransport(INTERVAL, engine=engine),
+])
+async def test_bus_converges_after_foreign_commit(transport):
+    bus = InvalidationBus()
+    invalidated = []
+    bus.subscribe(lambda: invalidated.append(True))
+    await bus.start(transport())
+    try:
+        await asyncio.sleep(INTERVAL * 5)
+        assert invalidated == [], (
+            'Без изменений данных кеши не должны сбрасываться.'
+        )
+        await commit_from_other_worker()
+        await wait_notifications(bus, 1)
+        assert invalidated == [True], (
+            'Изменение данных другим процессом должно сбрасывать кеши.'
+        )
+    finally:
+        await bus.stop()
+    assert not bus.is_running and bus.transport is None
+
+
+async def test_custom_transport_and_errors(monkeypatch):
+    monkeypatch.setattr(
+        'app.core.settings.cache_invalidation_interval', INTERVAL
+    )
+
+    class QueueTransport(InvalidationTransport):
+        def __init__(self):
+            self.messages = asyncio.Queue()
+
+        async def wait(self):
+            message = await self.messages.get()
+            if isinstance(message, Exception):
+                raise message
+
+    transport = QueueTransport()
+    bus = InvalidationBus()
+    calls = []
+    bus.subscribe(lambda: calls.append('cache'))
+    await bus.start(transport)
+    try:
+        transport.messages.put_nowait('changed')
+        await wait_notifications(bus, 1)
+        transport.messages.put_nowait(ConnectionError())
+        await wait_notifications(bus, 2)
+    finally:
+        await bus.stop()
+    assert calls == ['cache', 'cache'], (
+        'Недоступный канал должен приводить к сбросу кешей.'
+    )
+    assert bus.stats['errors'] == 1
+
+
+def test_incomplete_transport_rejected():
+    class NoWaitTransport(InvalidationTransport):
+        pass
+
+    class NoTokenTransport(PollingTransport):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWaitTransport()
+    with pytest.raises(TypeError):
+        NoTokenTransport(INTERVAL)
+
+
+async def test_bus_disabled(monkeypatch):
+    monkeypatch.setattr(
+        'app.core.settings.cache_invalidation_transport', 'none'
+    )
+    bus = InvalidationBus()
+    await bus.start()
+    assert not bus.is_running
+    await bus.stop()
+
+
+async def test_project_cache_subscribed():
+    project_cache.put_list('all', 'cached', project_cache.generation)
+    notifications = invalidation_bus.stats['notifications']
+    await invalidation_bus.start(
+        DataVersionTransport(INTERVAL, session_factory=TestingSessionLocal)
+    )
+    try:
+        await commit_from_other_worker()
+        await wait_notifications(invalidation_bus, notifications + 1)
+    finally:
+        await invalidation_bus.stop()
+    assert project_cache.get_list('all') is None, (
+        'Кеш проектов должен сбрасываться по сигналу шины.'
+    )
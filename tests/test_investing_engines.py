@@ -0,0 +1,131 @@
+import pytest
+from conftest import engine
+from fixtures.investing import blend_projects
+from sqlalchemy import event
+
+from app.models import CharityProject, Donation
+from app.services.investing import stream_investing_process
+
+PROJECT_AMOUNTS = [100, 200, 300, 400, 500]
+DONATION_AMOUNTS = [50, 400, 1000, 100]
+
+
+def test_engines_give_same_allocation(client, mixer):
+    blend_projects(mixer, PROJECT_AMOUNTS)
+    for amount in DONATION_AMOUNTS:
+        client.post('/donation/', json={'full_amount': amount})
+    client.post('/charity_project/', json={
+        'name': 'new project',
+        'description': 'engine',
+        'full_amount': 30,
+    })
+    projects = [
+        (project['invested_amount'], project['fully_invested'])
+        for project in client.get('/charity_project/').json()
+    ]
+    donations = [
+        (donation['invested_amount'], donation['fully_invested'])
+        for donation in client.get('/donation/').json()
+    ]
+    assert projects == [
+        (100, True), (200, True), (300, True), (400, True), (500, True),
+        (30, True),
+    ], 'Движки распределения должны одинаково закрывать проекты.'
+    assert donations == [
+        (50, True), (400, True), (1000, True), (80, False),
+    ], 'Движки распределения должны одинаково расходовать пожертвования.'
+
+
+@pytest.mark.parametrize('investing_engine', ['sql'], indirect=True)
+def test_sql_engine_statement_count(client, mixer):
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+
+    counts = []
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_statement)
+    try:
+        for projects_count in (2, 50):
+            blend_projects(
+                mixer, [10] * projects_count, prefix=str(projects_count)
+            )
+            statements.clear()
+            client.post(
+                '/donation/', json={'full_amount': 10 * projects_count}
+            )
+            counts.append(len(statements))
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', count_statement
+        )
+    assert counts[0] == counts[1], (
+        'Количество запросов SQL-движка не должно зависеть от количества '
+        'закрываемых проектов.'
+    )
+
+
+async def test_stream_investing_stops_at_target():
+    pulled = []
+
+    async def sources():
+        for number in range(1000):
+            pulled.append(number)
+            yield CharityProject(full_amount=10, invested_amount=0)
+
+    target = Donation(full_amount=25, invested_amount=0)
+    modified = await stream_investing_process(target, sources())
+    assert target.fully_invested and len(modified) == 3, (
+        'Пожертвование должно быть распределено по трём проектам.'
+    )
+    assert len(pulled) == 3, (
+        'Потоковое распределение не должно запрашивать источники '
+        'после закрытия цели.'
+    )
+
+
+def test_writes_without_follow_up_reads(client, mixer):
+    blend_projects(mixer, [100, 200])
+    statements = []
+
+    def collect_statement(*args):
+        statements.append(' '.join(args[2].split()[:3]))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', collect_statement)
+    try:
+        client.post('/donation/', json={'full_amount': 150})
+        donation_inserts = [
+            statement for statement in statements
+            if statement.startswith('INSERT')
+        ]
+        # Версия данных увеличивается первой записью, чтобы взять
+        # блокировку записи до чтения источников.
+        assert statements[0].startswith('UPDATE dataversion')
+        donation_statements = [
+            statement.split()[0] for statement in statements[1:]
+        ]
+        statements.clear()
+        client.patch(
+            '/charity_project/2', json={'description': 'new', 'full_amount': 300}
+        )
+        statements = [statement.split()[0] for statement in statements]
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', collect_statement
+        )
+    first_write = min(
+        donation_statements.index(verb)
+        for verb in ('INSERT', 'UPDATE') if verb in donation_statements
+    )
+    assert 'SELECT' not in donation_statements[first_write:], (
+        'После записи пожертвования не должно быть повторных чтений.'
+    )
+    assert [
+        statement for statement in donation_inserts
+        if 'summary' not in statement
+    ] == ['INSERT INTO donation', 'INSERT INTO investment'], (
+        'Пожертвование должно вставляться сразу с вложенной суммой.'
+    )
+    assert statements[0] == 'SELECT' and 'SELECT' not in statements[1:], (
+        'Обновление проекта не должно перечитывать его после фиксации.'
+    )
@@ -0,0 +1,48 @@
+from fixtures.investing import blend_projects
+
+
+def test_allocation_records_transfers(client, mixer):
+    projects = blend_projects(mixer, [100, 200])
+    donation = client.post('/donation/', json={'full_amount': 250}).json()
+    response = client.get(f'/donation/{donation["id"]}/investments')
+    assert response.status_code == 200, (
+        'Переводы пожертвования должны быть доступны суперюзеру.'
+    )
+    transfers = [
+        (investment['project_id'], investment['amount'])
+        for investment in response.json()
+    ]
+    assert transfers == [(projects[0].id, 100), (projects[1].id, 150)], (
+        'Каждый перевод из пожертвования в проект должен быть записан.'
+    )
+    project = client.post('/charity_project/', json={
+        'name': 'records',
+        'description': 'records',
+        'full_amount': 500,
+    }).json()
+    client.post('/donation/bulk', json=[
+        {'full_amount': 60}, {'full_amount': 70}
+    ])
+    response = client.get(f'/charity_project/{projects[1].id}/investments')
+    assert [
+        investment['amount'] for investment in response.json()
+    ] == [150, 50], 'Проект должен видеть всех своих жертвователей.'
+    response = client.get(f'/charity_project/{project["id"]}/investments')
+    assert [
+        investment['amount'] for investment in response.json()
+    ] == [10, 70], (
+        'Остатки пакетных пожертвований должны уйти в следующий проект.'
+    )
+
+
+def test_investments_not_found(superuser_client):
+    assert superuser_client.get(
+        '/charity_project/1/investments'
+    ).status_code == 404
+    assert superuser_client.get('/donation/1/investments').status_code == 404
+
+
+def test_investments_superuser_only(user_client, donation):
+    assert user_client.get(
+        f'/donation/{donation.id}/investments'
+    ).status_code == 401
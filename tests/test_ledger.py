@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from conftest import engine
+from sqlalchemy import event
+
+from app.crud import charity_project_crud
+from app.services import charity_project_ledger, donation_ledger
+from app.services.ledger import OpenCapacityLedger
+
+
+def test_ledger_queue_order_and_head():
+    ledger = OpenCapacityLedger(charity_project_crud)
+    ledger.load([
+        (2, datetime(2020, 1, 2), 50),
+        (1, datetime(2020, 1, 1), 100),
+        (3, datetime(2020, 1, 3), 10),
+    ])
+    assert ledger.fingerprint == (3, 160), (
+        'Реестр должен хранить количество объектов и сумму их остатков.'
+    )
+    assert ledger.head(120) == [1, 2], (
+        'Реестр должен отдавать самые старые объекты, остатков которых '
+        'хватает на сумму.'
+    )
+    ledger.put(1, datetime(2020, 1, 1), 0)
+    ledger.put(4, datetime(2019, 1, 1), 5)
+    assert ledger.fingerprint == (3, 65), (
+        'Закрытые объекты должны удаляться из реестра.'
+    )
+    assert ledger.head(60) == [4, 2, 3], (
+        'Новые объекты должны занимать место в очереди по дате создания.'
+    )
+
+
+def test_ledger_follows_donations(user_client, charity_project,
+                                  charity_project_nunchaku):
+    user_client.post('/donation/', json={'full_amount': 1000})
+    assert charity_project_ledger.remaining(charity_project.id) == 999000, (
+        'После пожертвования реестр должен хранить новый остаток проекта.'
+    )
+    user_client.post('/donation/', json={'full_amount': 999500})
+    assert charity_project_ledger.remaining(charity_project.id) is None, (
+        'Закрытый проект должен быть удалён из реестра.'
+    )
+    assert (
+        charity_project_ledger.remaining(charity_project_nunchaku.id) ==
+        4999500
+    ), 'Остаток пожертвования должен уйти в следующий по дате проект.'
+    assert charity_project_nunchaku.invested_amount == 500
+
+
+def test_ledger_resyncs_with_db(superuser_client, donation, another_donation):
+    response = superuser_client.post('/charity_project/', json={
+        'name': 'ledger',
+        'description': 'ledger',
+        'full_amount': 150,
+    })
+    assert response.json()['fully_invested'], (
+        'Реестр должен учитывать пожертвования, созданные в обход API.'
+    )
+    assert donation_ledger.remaining(donation.id) is None
+    assert donation_ledger.remaining(another_donation.id) == 1950
+
+
+def test_ledger_checked_without_scanning_open_rows(
+        user_client, charity_project
+):
+    user_client.post('/donation/', json={'full_amount': 10})
+    statements = []
+
+    def collect_statement(*args):
+        statements.append(args[2].lower())
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', collect_statement)
+    try:
+        user_client.post('/donation/', json={'full_amount': 10})
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', collect_statement
+        )
+    assert not any(
+        'count(' in sql or 'sum(' in sql for sql in statements
+    ), 'Реестр должен сверяться со строкой итогов, а не со всеми объектами.'
+    assert charity_project_ledger.remaining(charity_project.id) == 999980
@@ -0,0 +1,40 @@
+import json
+
+from fixtures.investing import blend_projects
+
+from app.core import settings
+
+NDJSON = {'Accept': 'application/x-ndjson'}
+
+
+def read_lines(response):
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson', (
+        'Выгрузка должна отдаваться как application/x-ndjson.'
+    )
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_projects_ndjson_export(client, mixer, monkeypatch):
+    monkeypatch.setattr(settings, 'export_yield_per', 2)
+    blend_projects(mixer, [10] * 5)
+    rows = read_lines(client.get('/charity_project/', headers=NDJSON))
+    assert rows == client.get('/charity_project/').json(), (
+        'Построчная выгрузка должна совпадать с обычным списком.'
+    )
+    rows = read_lines(client.get(
+        '/charity_project/', headers=NDJSON, params={'limit': 2}
+    ))
+    assert [row['id'] for row in rows] == [1, 2]
+
+
+def test_donations_ndjson_export(client):
+    for amount in (10, 20, 30):
+        client.post('/donation/', json={'full_amount': amount})
+    rows = read_lines(client.get('/donation/', headers=NDJSON))
+    assert rows == client.get('/donation/').json()
+    rows = read_lines(client.get('/donation/my', headers=NDJSON))
+    assert rows == client.get('/donation/my').json(), (
+        'Выгрузка своих пожертвований должна скрывать те же поля.'
+    )
+    assert 'user_id' not in rows[0]
@@ -0,0 +1,62 @@
+from fixtures.investing import blend_projects
+
+
+def collect_pages(client, url, limit):
+    pages = []
+    params = {'limit': limit}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append([obj['id'] for obj in response.json()])
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            return pages
+        params = {'limit': limit, 'after': cursor}
+
+
+def test_projects_keyset_pages(client, mixer):
+    projects = blend_projects(mixer, [10] * 7)
+    assert collect_pages(client, '/charity_project/', 3) == [
+        [1, 2, 3], [4, 5, 6], [7]
+    ], 'Страницы должны идти по порядку создания без пропусков и повторов.'
+    response = client.get('/charity_project/')
+    assert len(response.json()) == len(projects), (
+        'Без limit список должен возвращаться целиком.'
+    )
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_donations_keyset_pages(client):
+    for amount in range(1, 6):
+        client.post('/donation/', json={'full_amount': amount})
+    for url in ('/donation/', '/donation/my'):
+        assert collect_pages(client, url, 2) == [[1, 2], [3, 4], [5]], (
+            f'Страницы {url} должны идти по порядку создания.'
+        )
+
+
+def test_investments_keyset_pages(client, mixer):
+    blend_projects(mixer, [10, 10, 10])
+    donation = client.post('/donation/', json={'full_amount': 30}).json()
+    client.post('/donation/bulk', json=[{'full_amount': 10}] * 3)
+    project = client.post('/charity_project/', json={
+        'name': 'pages',
+        'description': 'pages',
+        'full_amount': 30,
+    }).json()
+    for url, pages in (
+        (f'/donation/{donation["id"]}/investments', [[1, 2], [3]]),
+        (f'/charity_project/{project["id"]}/investments', [[4, 5], [6]]),
+    ):
+        assert collect_pages(client, url, 2) == pages, (
+            f'Страницы {url} должны идти по порядку создания.'
+        )
+
+
+def test_invalid_page_params(client):
+    assert client.get(
+        '/donation/', params={'after': 'not a cursor'}
+    ).status_code == 422
+    assert client.get(
+        '/charity_project/', params={'limit': 0}
+    ).status_code == 422
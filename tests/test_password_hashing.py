@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+from conftest import app, get_async_session, override_db
+from fastapi.testclient import TestClient
+
+from app.core.user import ThreadPoolPasswordHelper
+
+
+async def test_hashing_in_thread_pool():
+    helper = ThreadPoolPasswordHelper(rounds=4, concurrency=2)
+    hashed = await helper.hash_async('secret')
+    assert hashed.startswith('$2b$04$'), (
+        'Стоимость bcrypt должна браться из настроек.'
+    )
+    assert await helper.verify_and_update_async('secret', hashed) == (
+        True, None
+    )
+    assert (await helper.verify_and_update_async('wrong', hashed))[0] is False
+    name = await helper._run(lambda: threading.current_thread().name)
+    assert name.startswith('password-hash'), (
+        'Пароли должны хешироваться в отдельном пуле потоков.'
+    )
+
+
+async def test_inline_hashing_without_threads():
+    helper = ThreadPoolPasswordHelper(rounds=4, concurrency=0)
+    assert helper.executor is None
+    name = await helper._run(lambda: threading.current_thread().name)
+    assert name == threading.current_thread().name
+
+
+async def test_event_loop_not_blocked():
+    helper = ThreadPoolPasswordHelper(rounds=12, concurrency=1)
+    loop = asyncio.get_running_loop()
+    gaps = []
+    hashing = asyncio.ensure_future(helper.hash_async('secret'))
+    start = time.perf_counter()
+    while not hashing.done():
+        tick = loop.time()
+        await asyncio.sleep(0.001)
+        gaps.append(loop.time() - tick)
+    duration = time.perf_counter() - start
+    await hashing
+    assert max(gaps) < duration / 2, (
+        'Цикл событий не должен ждать расчёта хеша.'
+    )
+
+
+def test_login_and_password_change():
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    credentials = {'username': 'hash@fund.com', 'password': 'first pass'}
+    with TestClient(app) as client:
+        client.post('/auth/register', json={
+            'email': credentials['username'],
+            'password': credentials['password'],
+        })
+        assert client.post('/auth/jwt/login', data={
+            **credentials, 'password': 'wrong pass',
+        }).status_code == 400
+        token = client.post(
+            '/auth/jwt/login', data=credentials
+        ).json()['access_token']
+        client.patch(
+            '/users/me', json={'password': 'second pass'},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert client.post('/auth/jwt/login', data=credentials).status_code == 400
+        assert client.post('/auth/jwt/login', data={
+            **credentials, 'password': 'second pass',
+        }).status_code == 200, 'Вход должен работать с новым паролем.'
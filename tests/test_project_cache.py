@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+
+from conftest import TEST_DB, engine, read_engine
+from fixtures.investing import blend_projects
+from sqlalchemy import create_engine, event, text
+
+from app.api.validators import NO_DELETION_FOR_INVESTED_PROJECT_ERROR_MESSAGE
+from app.services import write_retry
+from app.services.project_cache import ProjectCache, project_cache
+
+
+@contextmanager
+def collect_statements():
+    statements = []
+
+    def collect_statement(*args):
+        statements.append(args[2])
+
+    for listened in engine, read_engine:
+        event.listen(
+            listened.sync_engine, 'before_cursor_execute', collect_statement
+        )
+    try:
+        yield statements
+    finally:
+        for listened in engine, read_engine:
+            event.remove(
+                listened.sync_engine, 'before_cursor_execute',
+                collect_statement
+            )
+
+
+def test_list_served_from_cache(client, mixer):
+    blend_projects(mixer, [100, 200])
+    first = client.get('/charity_project/')
+    hits = project_cache.stats['list_hits']
+    with collect_statements() as statements:
+        second = client.get('/charity_project/')
+    assert statements == [], (
+        'Повторный запрос списка не должен обращаться к БД.'
+    )
+    assert project_cache.stats['list_hits'] == hits + 1
+    assert second.content == first.content
+    assert second.headers['ETag'] == first.headers['ETag']
+    not_modified = client.get(
+        '/charity_project/',
+        headers={'If-None-Match': first.headers['ETag']},
+    )
+    assert not_modified.status_code == 304, (
+        'Ответ из кеша должен учитывать If-None-Match.'
+    )
+
+
+def test_list_cache_keyed_by_page(client, mixer):
+    blend_projects(mixer, [100, 200, 300])
+    full = client.get('/charity_project/').json()
+    page = client.get('/charity_project/', params={'limit': 1})
+    assert page.json() == full[:1], 'Страницы должны кешироваться отдельно.'
+    cached_page = client.get('/charity_project/', params={'limit': 1})
+    assert cached_page.headers['X-Next-Cursor'] == (
+        page.headers['X-Next-Cursor']
+    ), 'Курсор следующей страницы должен сохраняться в кеше.'
+
+
+def test_writes_invalidate_cache(client, mixer):
+    blend_projects(mixer, [100, 200])
+    invalidations = project_cache.stats['invalidations']
+    before = client.get('/charity_project/').json()
+    client.post('/donation/', json={'full_amount': 150})
+    allocated = client.get('/charity_project/').json()
+    assert allocated != before, (
+        'Распределение пожертвования должно сбрасывать кеш списка.'
+    )
+    assert allocated[0]['fully_invested'] is True
+    project = client.post('/charity_project/', json={
+        'name': 'cache', 'description': 'cache', 'full_amount': 10,
+    }).json()
+    assert len(client.get('/charity_project/').json()) == 3
+    client.patch(
+        f'/charity_project/{project["id"]}',
+        json={'description': 'changed', 'full_amount': 20},
+    )
+    assert client.get('/charity_project/').json()[2]['description'] == (
+        'changed'
+    )
+    client.delete(f'/charity_project/{project["id"]}')
+    assert len(client.get('/charity_project/').json()) == 2
+    assert project_cache.stats['invalidations'] >= invalidations + 4
+
+
+def test_project_lookup_cached(client, mixer):
+    blend_projects(mixer, [100])
+    client.get('/charity_project/1/investments')
+    hits = project_cache.stats['project_hits']
+    with collect_statements() as statements:
+        client.get('/charity_project/1/investments')
+    assert project_cache.stats['project_hits'] == hits + 1
+    assert not any('FROM charityproject' in sql for sql in statements), (
+        'Проект из кеша не должен повторно читаться из БД.'
+    )
+    response = client.patch(
+        '/charity_project/1', json={'description': 'new', 'full_amount': 300}
+    )
+    assert response.status_code == 200, (
+        'Проект из кеша должен изменяться как прочитанный из БД.'
+    )
+    assert response.json()['description'] == 'new'
+    assert project_cache.get_project(1) is None, (
+        'Изменение проекта должно сбрасывать его снимок.'
+    )
+
+
+def test_stale_snapshot_not_written(client, mixer):
+    blend_projects(mixer, [100])
+    client.get('/charity_project/1/investments')
+    with create_engine(f'sqlite:///{TEST_DB}').begin() as conn:
+        conn.execute(text(
+            'UPDATE charityproject SET version = version + 1, '
+            "invested_amount = 40, description = 'outside' WHERE id = 1"
+        ))
+    response = client.patch(
+        '/charity_project/1', json={'description': 'new'}
+    )
+    assert response.status_code == 200
+    assert response.json()['invested_amount'] == 40, (
+        'Изменение по устаревшему снимку должно повторяться '
+        'по актуальной строке.'
+    )
+    response = client.patch('/charity_project/1', json={'full_amount': 30})
+    assert response.status_code == 422, (
+        'Проверка суммы должна учитывать актуальную вложенную сумму.'
+    )
+
+
+def test_cache_size_and_generation():
+    cache = ProjectCache(maxsize=2, ttl=60)
+    for key in range(3):
+        cache.put_list(key, key, cache.generation)
+    assert len(cache.lists) == 2, 'Размер кеша должен быть ограничен.'
+    assert cache.get_list(0) is None and cache.get_list(2) == 2
+    assert cache.stats['list_misses'] == 1
+    generation = cache.generation
+    cache.invalidate({1})
+    cache.put_list('stale', 'stale', generation)
+    assert cache.get_list('stale') is None, (
+        'Значение, прочитанное до сброса, не должно попадать в кеш.'
+    )
+
+
+def test_delete_rereads_stale_snapshot(client, mixer):
+    blend_projects(mixer, [100])
+    write_retry.stats.clear()
+    client.get('/charity_project/1/investments')
+    with create_engine(f'sqlite:///{TEST_DB}').begin() as conn:
+        conn.execute(text(
+            'UPDATE charityproject SET version = version + 1, '
+            'invested_amount = 40 WHERE id = 1'
+        ))
+    response = client.delete('/charity_project/1')
+    assert response.status_code == 400, (
+        'Удаление по устаревшему снимку должно проверяться '
+        'по актуальной строке.'
+    )
+    assert response.json() == {
+        'detail': NO_DELETION_FOR_INVESTED_PROJECT_ERROR_MESSAGE
+    }
+    assert write_retry.stats['stale_retries'] <= 1
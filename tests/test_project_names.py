@@ -0,0 +1,66 @@
+from conftest import engine
+from fixtures.investing import blend_projects
+from sqlalchemy import event
+
+from app.api.validators import DUPLICATE_PROJECT_NAME_ERROR_MESSAGE
+
+
+def create_project(client, name):
+    return client.post('/charity_project/', json={
+        'name': name, 'description': 'names', 'full_amount': 100,
+    })
+
+
+def test_normalized_name_duplicates_rejected(client):
+    assert create_project(client, 'Еда для котиков').status_code == 200
+    for name in ('Еда для котиков', 'ЕДА для котиков', '  еда  для\tкотиков '):
+        response = create_project(client, name)
+        assert response.status_code == 400, (
+            'Название, совпадающее без учёта регистра и пробелов, '
+            'должно отклоняться.'
+        )
+        assert response.json() == {
+            'detail': DUPLICATE_PROJECT_NAME_ERROR_MESSAGE
+        }
+    assert create_project(client, 'Еда для собак').status_code == 200, (
+        'После отклонённой вставки проекты должны создаваться.'
+    )
+    assert len(client.get('/charity_project/').json()) == 2
+
+
+def test_rename_to_normalized_duplicate(client, mixer):
+    blend_projects(mixer, [100, 200])
+    response = client.patch(
+        '/charity_project/2', json={'name': ' PROJECT 0', 'full_amount': 200}
+    )
+    assert response.status_code == 400
+    assert response.json() == {'detail': DUPLICATE_PROJECT_NAME_ERROR_MESSAGE}
+
+
+def test_create_in_one_transaction(client):
+    client.post('/donation/', json={'full_amount': 50})
+    statements = []
+    commits = []
+
+    def collect_statement(*args):
+        statements.append(args[2])
+
+    def collect_commit(connection):
+        commits.append(connection)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', collect_statement)
+    event.listen(engine.sync_engine, 'commit', collect_commit)
+    try:
+        response = create_project(client, 'single')
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', collect_statement
+        )
+        event.remove(engine.sync_engine, 'commit', collect_commit)
+    assert response.json()['invested_amount'] == 50
+    assert not any('normalized_name =' in sql for sql in statements), (
+        'Название не должно проверяться отдельным запросом.'
+    )
+    assert len(commits) == 1, (
+        'Создание проекта должно занимать одну транзакцию записи.'
+    )
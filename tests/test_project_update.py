@@ -0,0 +1,68 @@
+from conftest import engine
+from fixtures.investing import blend_projects
+from sqlalchemy import event
+
+
+def collect_statements(client, method, *args, **kwargs):
+    statements = []
+
+    def collect_statement(*args):
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', collect_statement)
+    try:
+        response = getattr(client, method)(*args, **kwargs)
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', collect_statement
+        )
+    return response, statements
+
+
+def test_update_without_reread(client, mixer):
+    blend_projects(mixer, [100])
+    client.get('/charity_project/1/investments')
+    response, statements = collect_statements(
+        client, 'patch', '/charity_project/1',
+        json={'description': 'new', 'full_amount': 300},
+    )
+    assert response.status_code == 200
+    assert response.json()['description'] == 'new'
+    assert response.json()['full_amount'] == 300
+    assert not any(
+        sql.startswith('SELECT') and 'FROM charityproject' in sql
+        for sql in statements
+    ), 'Проект не должен перечитываться при изменении.'
+    assert client.get('/charity_project/').json()[0]['full_amount'] == 300
+
+
+def test_update_closes_project(client, mixer):
+    blend_projects(mixer, [100])
+    client.post('/donation/', json={'full_amount': 40})
+    response = client.patch('/charity_project/1', json={'full_amount': 40})
+    assert response.status_code == 200
+    assert response.json()['fully_invested'] is True
+    assert response.json()['close_date'] is not None, (
+        'Проект, набравший новую сумму, должен закрываться.'
+    )
+    assert client.get('/charity_project/stats').json()[
+        'open_project_count'
+    ] == 0
+
+
+def test_update_rejections(client, mixer):
+    blend_projects(mixer, [100, 200])
+    client.post('/donation/', json={'full_amount': 150})
+    assert client.patch(
+        '/charity_project/2', json={'full_amount': 40}
+    ).status_code == 422, 'Сумма меньше вложенной должна отклоняться.'
+    assert client.patch(
+        '/charity_project/1', json={'description': 'closed'}
+    ).status_code == 400, 'Закрытый проект нельзя изменять.'
+    assert client.patch(
+        '/charity_project/3', json={'description': 'missing'}
+    ).status_code == 404
+    project = client.get('/charity_project/').json()[1]
+    assert project['full_amount'] == 200, (
+        'Отклонённое изменение не должно записываться.'
+    )
@@ -0,0 +1,75 @@
+import pytest
+from conftest import TestingReadSessionLocal, engine, read_engine
+from fixtures.investing import blend_projects
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import Settings
+from app.core.db import get_read_only_url
+
+
+@pytest.mark.parametrize('url, expected', [
+    (
+        'sqlite+aiosqlite:///./fund.db',
+        'sqlite+aiosqlite:///file:./fund.db?mode=ro&uri=true',
+    ),
+    ('sqlite+aiosqlite://', 'sqlite+aiosqlite://'),
+    (
+        'postgresql+asyncpg://user@replica/fund',
+        'postgresql+asyncpg://user@replica/fund',
+    ),
+])
+def test_read_only_url(url, expected):
+    assert str(get_read_only_url(url)) == expected
+
+
+def test_read_url_follows_main_url():
+    assert Settings(
+        _env_file=None, database_url='postgresql+asyncpg://primary/fund'
+    ).read_database_url == 'postgresql+asyncpg://primary/fund', (
+        'Без отдельного адреса чтение должно идти из основной БД.'
+    )
+    assert Settings(
+        _env_file=None,
+        database_url='postgresql+asyncpg://primary/fund',
+        read_database_url='postgresql+asyncpg://replica/fund',
+    ).read_database_url == 'postgresql+asyncpg://replica/fund'
+
+
+async def test_read_session_cannot_write():
+    async with TestingReadSessionLocal() as session:
+        with pytest.raises(OperationalError, match='readonly'):
+            await session.execute(text('DELETE FROM charityproject'))
+
+
+def test_get_routes_use_read_engine(client, mixer):
+    blend_projects(mixer, [100])
+    client.post('/donation/', json={'full_amount': 50})
+    statements = {engine: [], read_engine: []}
+
+    def collector(listened):
+        def collect_statement(*args):
+            statements[listened].append(args[2])
+        return collect_statement
+
+    listeners = {
+        listened: collector(listened) for listened in statements
+    }
+    for listened, listener in listeners.items():
+        event.listen(listened.sync_engine, 'before_cursor_execute', listener)
+    try:
+        for url in (
+            '/charity_project/', '/charity_project/stats',
+            '/charity_project/1/investments', '/donation/',
+            '/donation/my', '/donation/my/summary',
+        ):
+            assert client.get(url).status_code == 200
+    finally:
+        for listened, listener in listeners.items():
+            event.remove(
+                listened.sync_engine, 'before_cursor_execute', listener
+            )
+    assert statements[engine] == [], (
+        'GET-запросы не должны занимать соединения основного движка.'
+    )
+    assert statements[read_engine]
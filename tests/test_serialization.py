@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from conftest import TestingSessionLocal
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.crud import charity_project_crud, donation_crud
+from app.schemas import CharityProjectDB, DonationDB
+
+
+def validated_body(db_objs, schema, **options):
+    """Тело ответа, которое собрал бы response_model."""
+    return JSONResponse(jsonable_encoder(
+        [schema.from_orm(db_obj) for db_obj in db_objs], **options
+    )).body
+
+
+async def test_rows_match_response_model(client, mixer):
+    mixer.blend(
+        'app.models.charity_project.CharityProject',
+        name='Котики «на счастье»',
+        description='Описание с кавычками " и \\ обратной чертой',
+        full_amount=100,
+        create_date=datetime(2010, 10, 10, 12, 30, 15, 123456),
+    )
+    mixer.blend(
+        'app.models.charity_project.CharityProject',
+        name='closed',
+        description='closed',
+        full_amount=10,
+        invested_amount=10,
+        fully_invested=True,
+        create_date=datetime(2010, 10, 11),
+        close_date=datetime(2010, 10, 12, 8),
+    )
+    client.post('/donation/', json={'full_amount': 50, 'comment': 'Мяу'})
+    client.post('/donation/', json={'full_amount': 70})
+    async with TestingSessionLocal() as session:
+        projects = await charity_project_crud.get_page(session)
+        donations = await donation_crud.get_page(session)
+    assert client.get('/charity_project/').content == validated_body(
+        projects, CharityProjectDB, exclude_none=True
+    ), 'Быстрый ответ должен совпадать с ответом схемы байт в байт.'
+    assert client.get('/donation/').content == validated_body(
+        donations, DonationDB, exclude_none=True
+    )
+    assert client.get('/donation/my').content == validated_body(
+        donations, DonationDB, exclude_none=True, exclude={
+            'user_id', 'invested_amount', 'fully_invested', 'close_date'
+        }
+    )
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from conftest import (
+    TEST_DB, TestingSessionLocal, app, engine, get_async_session,
+    get_read_session, override_db, override_read_db
+)
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from app.core.user_cache import user_cache
+from app.models import User
+from app.services.invalidation import DataVersionTransport, invalidation_bus
+
+EMAIL = 'cached@fund.com'
+PASSWORD = 'chimichangas4life'
+
+
+@pytest.fixture
+def auth_client():
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[get_read_session] = override_read_db
+    with TestClient(app) as client:
+        client.post(
+            '/auth/register', json={'email': EMAIL, 'password': PASSWORD}
+        )
+        token = client.post(
+            '/auth/jwt/login', data={'username': EMAIL, 'password': PASSWORD}
+        ).json()['access_token']
+        client.headers['Authorization'] = f'Bearer {token}'
+        yield client
+
+
+def get_user_selects(client, url):
+    statements = []
+
+    def collect_statement(*args):
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', collect_statement)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', collect_statement
+        )
+    return response, [
+        sql for sql in statements
+        if sql.startswith('SELECT') and 'FROM user' in sql
+    ]
+
+
+def test_user_served_from_cache(auth_client):
+    response, selects = get_user_selects(auth_client, '/users/me')
+    assert response.status_code == 200
+    assert len(selects) == 1
+    hits = user_cache.stats['hits']
+    response, selects = get_user_selects(auth_client, '/users/me')
+    assert response.json()['email'] == EMAIL
+    assert selects == [], (
+        'Пользователь из кеша не должен читаться из БД повторно.'
+    )
+    assert user_cache.stats['hits'] == hits + 1
+    assert auth_client.post(
+        '/donation/', json={'full_amount': 10}
+    ).status_code == 200, 'Пользователь из кеша должен подходить для записи.'
+
+
+def test_cache_reset_on_update(auth_client):
+    auth_client.get('/users/me')
+    response = auth_client.patch(
+        '/users/me', json={'email': 'renamed@fund.com'}
+    )
+    assert response.status_code == 200
+    response, selects = get_user_selects(auth_client, '/users/me')
+    assert response.json()['email'] == 'renamed@fund.com', (
+        'После изменения пользователя кеш должен сбрасываться.'
+    )
+    assert len(selects) == 1
+
+
+async def test_deactivated_user_rejected(auth_client):
+    assert auth_client.get('/users/me').status_code == 200
+    async with TestingSessionLocal() as session:
+        user = await session.scalar(select(User).where(User.email == EMAIL))
+        user.is_active = False
+        await session.commit()
+    assert auth_client.get('/users/me').status_code == 401, (
+        'Деактивированный пользователь не должен оставаться в кеше.'
+    )
+
+
+def test_invalid_token_not_cached(auth_client):
+    auth_client.get('/users/me')
+    auth_client.headers['Authorization'] = 'Bearer broken'
+    assert auth_client.get('/users/me').status_code == 401
+
+
+def deactivate_in_other_worker(user_id):
+    """
+    Деактивация пользователя сессией другого воркера. Его кеш
+    сбрасывается после фиксации, но кеш этого процесса — только шиной.
+    """
+    with Session(create_engine(f'sqlite:///{TEST_DB}')) as session:
+        session.get(User, user_id).is_active = False
+        session.commit()
+
+
+async def test_cache_reset_by_other_worker():
+    async with TestingSessionLocal() as session:
+        user = User(email=EMAIL, hashed_password='hash')
+        session.add(user)
+        await session.commit()
+    notifications = invalidation_bus.stats['notifications']
+    await invalidation_bus.start(
+        DataVersionTransport(0.01, session_factory=TestingSessionLocal)
+    )
+    try:
+        deactivate_in_other_worker(user.id)
+        user_cache.put(str(user.id), user, user_cache.generation)
+
+        async def notified():
+            while invalidation_bus.stats['notifications'] == notifications:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(notified(), 2)
+    finally:
+        await invalidation_bus.stop()
+    assert user_cache.get(str(user.id)) is None, (
+        'Пользователь, изменённый другим воркером, должен сбрасываться '
+        'из кеша по сигналу шины.'
+    )
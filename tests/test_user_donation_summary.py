@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+from conftest import TestingSessionLocal
+from fixtures.user import superuser
+from sqlalchemy import func, select
+
+from app.models import Donation
+
+
+async def get_user_totals(user_id):
+    async with TestingSessionLocal() as session:
+        return (await session.execute(
+            select(
+                func.count().label('donation_count'),
+                func.sum(Donation.full_amount).label('total_donated'),
+                func.sum(Donation.invested_amount).label('total_allocated'),
+            ).where(Donation.user_id == user_id)
+        )).one()._asdict()
+
+
+async def test_summary_follows_donations_and_allocation(client):
+    assert client.get('/donation/my/summary').json() == {
+        'donation_count': 0, 'total_donated': 0, 'total_allocated': 0,
+    }
+    client.post('/donation/', json={'full_amount': 100})
+    client.post('/donation/bulk', json=[
+        {'full_amount': 50}, {'full_amount': 70},
+    ])
+    assert client.get('/donation/my/summary').json() == {
+        'donation_count': 3, 'total_donated': 220, 'total_allocated': 0,
+    }
+    client.post('/charity_project/', json={
+        'name': 'summary', 'description': 'summary', 'full_amount': 130,
+    })
+    summary = client.get('/donation/my/summary').json()
+    assert summary == {
+        'donation_count': 3, 'total_donated': 220, 'total_allocated': 130,
+    }, 'Распределение пожертвований должно обновлять счётчики.'
+    assert summary == await get_user_totals(superuser.id), (
+        'Счётчики должны совпадать с посчитанными по пожертвованиям.'
+    )
+    client.post('/donation/', json={'full_amount': 10})
+    assert client.get('/donation/my/summary').json() == {
+        'donation_count': 4, 'total_donated': 230, 'total_allocated': 130,
+    }
+
+
+def test_summary_is_per_user(user_client, mixer):
+    for user_id, amount in (2, 40), (superuser.id, 100):
+        mixer.blend(
+            'app.models.donation.Donation',
+            user_id=user_id,
+            full_amount=amount,
+            invested_amount=0,
+            fully_invested=False,
+        )
+    assert user_client.get('/donation/my/summary').json() == {
+        'donation_count': 1, 'total_donated': 40, 'total_allocated': 0,
+    }, 'Счётчики должны считаться отдельно для каждого пользователя.'
+
+
+def test_user_donations_date_range(client, mixer):
+    start = datetime(2020, 1, 1)
+    for day in range(5):
+        mixer.blend(
+            'app.models.donation.Donation',
+            user_id=superuser.id,
+            full_amount=10,
+            invested_amount=0,
+            fully_invested=False,
+            create_date=start + timedelta(days=day),
+        )
+    response = client.get('/donation/my', params={
+        'created_from': (start + timedelta(days=1)).isoformat(),
+        'created_to': (start + timedelta(days=4)).isoformat(),
+        'limit': 2,
+    })
+    assert [obj['id'] for obj in response.json()] == [2, 3], (
+        'Период должен включать начало и не включать конец.'
+    )
+    response = client.get('/donation/my', params={
+        'created_from': (start + timedelta(days=1)).isoformat(),
+        'created_to': (start + timedelta(days=4)).isoformat(),
+        'limit': 2,
+        'after': response.headers['X-Next-Cursor'],
+    })
+    assert [obj['id'] for obj in response.json()] == [4]
+    assert 'X-Next-Cursor' not in response.headers
+    assert client.get('/donation/my', params={
+        'created_from': start.isoformat(),
+        'created_to': start.isoformat(),
+    }).status_code == 422
+
+
+def test_user_donations_date_range_with_offset(client, mixer):
+    start = datetime(2020, 1, 1)
+    for day in range(5):
+        mixer.blend(
+            'app.models.donation.Donation',
+            user_id=superuser.id,
+            full_amount=10,
+            invested_amount=0,
+            fully_invested=False,
+            create_date=start + timedelta(days=day),
+        )
+    created_from = (start + timedelta(days=1)).astimezone(
+        timezone(timedelta(hours=3))
+    )
+    response = client.get('/donation/my', params={
+        'created_from': created_from.isoformat(),
+        'created_to': (start + timedelta(days=4)).isoformat(),
+    })
+    assert response.status_code == 200, (
+        'Границы периода со смещением UTC и без него должны сравниваться.'
+    )
+    assert [obj['id'] for obj in response.json()] == [2, 3, 4], (
+        'Дата со смещением UTC должна переводиться в местное время.'
+    )
@@ -0,0 +1,196 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from conftest import SQLALCHEMY_DATABASE_URL, TEST_DB, app
+from fixtures.investing import blend_projects
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core import get_async_session, settings
+from app.core.config import Settings
+from app.core.db import get_write_pragmas, set_sqlite_pragmas
+from app.crud import charity_project_crud
+from app.main import DATABASE_BUSY_ERROR_MESSAGE
+from app.services import investing, write_retry
+
+
+def make_error(message):
+    return OperationalError('COMMIT', {}, sqlite3.OperationalError(message))
+
+
+@pytest.fixture(autouse=True)
+def clear_stats():
+    write_retry.stats.clear()
+
+
+def fail_first_calls(monkeypatch, target, name, count, message):
+    original = getattr(target, name)
+    calls = []
+
+    async def failing(*args, **kwargs):
+        calls.append(args)
+        if len(calls) <= count:
+            raise make_error(message)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(target, name, failing)
+    return calls
+
+
+def test_donation_retried_on_lock(client, mixer, monkeypatch):
+    [project] = blend_projects(mixer, [1000])
+    calls = fail_first_calls(
+        monkeypatch, investing, 'invest_many', 2, 'database is locked'
+    )
+    response = client.post('/donation/', json={'full_amount': 100})
+    assert response.status_code == 200, (
+        'Блокировка БД должна приводить к повтору, а не к ошибке.'
+    )
+    assert len(calls) == 3
+    assert write_retry.stats['locked_retries'] == 2
+    assert response.json()['id'] == 1, (
+        'Откатанные попытки не должны оставлять пожертвований.'
+    )
+    investments = client.get(f'/charity_project/{project.id}/investments')
+    assert [
+        investment['amount'] for investment in investments.json()
+    ] == [100]
+
+
+def test_update_retried_on_lock(client, mixer, monkeypatch):
+    blend_projects(mixer, [100])
+    fail_first_calls(
+        monkeypatch, charity_project_crud, 'update_open', 1,
+        'database is locked',
+    )
+    response = client.patch('/charity_project/1', json={'full_amount': 300})
+    assert response.status_code == 200
+    assert response.json()['full_amount'] == 300
+    assert write_retry.stats['locked_retries'] == 1
+
+
+def test_lock_retries_bounded_by_deadline(client, monkeypatch):
+    monkeypatch.setattr(settings, 'write_retry_delay', 0.05)
+    monkeypatch.setattr(settings, 'write_retry_deadline', 0.1)
+    fail_first_calls(
+        monkeypatch, investing, 'invest_many', 100, 'database is locked'
+    )
+    response = client.post('/donation/', json={'full_amount': 100})
+    assert response.status_code == 503, (
+        'Исчерпав время на повторы, запрос должен получать 503.'
+    )
+    assert response.json() == {'detail': DATABASE_BUSY_ERROR_MESSAGE}
+    assert 'Retry-After' in response.headers
+    assert write_retry.stats['locked_exhausted'] == 1
+    assert write_retry.stats['wait_ms'] <= 100
+
+
+def test_other_errors_not_retried(client, monkeypatch):
+    calls = fail_first_calls(
+        monkeypatch, investing, 'invest_many', 1, 'disk I/O error'
+    )
+    with pytest.raises(OperationalError):
+        client.post('/donation/', json={'full_amount': 100})
+    assert len(calls) == 1
+    assert not write_retry.stats
+
+
+def test_stale_retries_bounded_by_deadline(client, mixer, monkeypatch):
+    blend_projects(mixer, [1000])
+    invest_many = investing.invest_many
+    calls = []
+
+    async def conflicting_invest_many(targets, session):
+        calls.append(targets)
+        if len(calls) <= 6:
+            raise StaleDataError('charityproject')
+        await invest_many(targets, session)
+
+    monkeypatch.setattr(investing, 'invest_many', conflicting_invest_many)
+    response = client.post('/donation/', json={'full_amount': 100})
+    assert response.status_code == 200, (
+        'Повторы при конфликте версий должны ограничиваться временем '
+        'на запрос, а не тремя попытками.'
+    )
+    assert write_retry.stats['stale_retries'] == 6
+
+
+@pytest.fixture
+def write_engine_client(client):
+    """Клиент, пишущий через движок с PRAGMA соединений записи."""
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL, connect_args={'check_same_thread': False}
+    )
+    set_sqlite_pragmas(engine, get_write_pragmas(settings))
+    session_factory = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_write_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_write_db
+    yield client
+
+
+def hold_write_lock(seconds):
+    """Удержание блокировки записи из другого соединения, как в другом воркере."""
+    locked = threading.Event()
+
+    def hold():
+        connection = sqlite3.connect(TEST_DB, isolation_level=None)
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            locked.set()
+            time.sleep(seconds)
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    locked.wait()
+    return holder
+
+
+def test_real_lock_waited_by_retries(write_engine_client, mixer):
+    blend_projects(mixer, [1000])
+    holder = hold_write_lock(0.5)
+    response = write_engine_client.post('/donation/', json={'full_amount': 100})
+    holder.join()
+    assert response.status_code == 200, (
+        'Блокировка, снятая до конца времени на запрос, не должна '
+        'приводить к ошибке.'
+    )
+    assert write_retry.stats['locked_retries'] >= 1, (
+        'Блокировку должен ждать слой повторов, а не busy_timeout SQLite.'
+    )
+
+
+def test_real_lock_bounded_by_deadline(write_engine_client, monkeypatch):
+    monkeypatch.setattr(settings, 'write_retry_deadline', 0.5)
+    holder = hold_write_lock(2)
+    started = time.monotonic()
+    response = write_engine_client.post('/donation/', json={'full_amount': 100})
+    elapsed = time.monotonic() - started
+    holder.join()
+    assert response.status_code == 503
+    assert elapsed < 1.5, (
+        'Запрос должен получать 503 к концу времени на повторы, '
+        'а не после busy_timeout SQLite.'
+    )
+    assert write_retry.stats['locked_exhausted'] == 1
+
+
+def test_busy_timeout_within_deadline():
+    with pytest.raises(ValueError):
+        Settings(
+            _env_file=None,
+            write_retry_deadline=2,
+            write_retry_busy_timeout=5000,
+        )